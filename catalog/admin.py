@@ -6,8 +6,8 @@ from .models import AnalysisPost, Comment, Vote
 # Register only the JSON-backed AnalysisPost and related models
 @admin.register(AnalysisPost)
 class AnalysisPostAdmin(admin.ModelAdmin):
-    list_display = ("title", "author", "created_at", "updated_at")
-    readonly_fields = ("created_at", "updated_at")
+    list_display = ("title", "author", "upvotes", "downvotes", "created_at")
+    readonly_fields = ("created_at", "updated_at", "upvotes", "downvotes")
 
 
 admin.site.register(Vote)
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class CatalogConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "catalog"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_save
+
+        from catalog.clients import record_db_connection
+        from catalog.similarity import index_saved_post
+
+        connection_created.connect(record_db_connection)
+        post_save.connect(index_saved_post, sender="catalog.AnalysisPost")
@@ -0,0 +1,189 @@
+"""
+catalog/clients.py
+Lazily created, pooled clients for upstream services.
+
+Importing this module is cheap: the SDKs are only imported, and the clients
+only built, the first time a caller asks for them. Every client keeps its
+connections alive and is shared by all threads of the process; pool sizes
+come from the ``UPSTREAM_*`` settings.
+
+Functions
+---------
+llm()                  -> openai.OpenAI
+price_session()        -> curl_cffi.requests.Session
+ticker(symbol: str)    -> yfinance.Ticker
+pool_stats()           -> dict
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from django.conf import settings
+
+# ---------- metrics ----------------------------------------------------------
+
+
+@dataclass
+class PoolMetrics:
+    """Thread-safe counters for one upstream connection pool."""
+
+    requests: int = 0
+    new_connections: int = 0
+    reused_connections: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def started(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finished(self, connected: bool | None) -> None:
+        """*connected*: a new connection was opened; ``None`` on failure."""
+        with self._lock:
+            self.in_flight -= 1
+            if connected is None:
+                self.errors += 1
+            elif connected:
+                self.new_connections += 1
+            else:
+                self.reused_connections += 1
+
+    def connected(self) -> None:
+        with self._lock:
+            self.new_connections += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": self.reused_connections,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+            }
+
+
+METRICS = {"llm": PoolMetrics(), "prices": PoolMetrics(), "db": PoolMetrics()}
+
+
+def record_db_connection(sender, connection, **kwargs) -> None:
+    """``connection_created`` receiver: counts fresh database connections."""
+    METRICS["db"].connected()
+
+
+# ---------- LLM --------------------------------------------------------------
+
+
+@lru_cache(maxsize=1)
+def _llm_transport():
+    import httpx
+
+    metrics = METRICS["llm"]
+
+    class MeteredTransport(httpx.HTTPTransport):
+        def handle_request(self, request):
+            opened = []
+
+            def trace(name, info):
+                if name == "connection.connect_tcp.complete":
+                    opened.append(True)
+
+            request.extensions = {**request.extensions, "trace": trace}
+            metrics.started()
+            try:
+                response = super().handle_request(request)
+            except Exception:
+                metrics.finished(None)
+                raise
+            metrics.finished(bool(opened))
+            return response
+
+        def pool_state(self) -> dict:
+            conns = list(self._pool.connections)
+            return {"open": len(conns), "idle": sum(c.is_idle() for c in conns)}
+
+    limits = httpx.Limits(
+        max_connections=settings.UPSTREAM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.UPSTREAM_MAX_KEEPALIVE,
+        keepalive_expiry=settings.UPSTREAM_KEEPALIVE_EXPIRY,
+    )
+    return MeteredTransport(limits=limits)
+
+
+@lru_cache(maxsize=1)
+def llm():
+    """
+    The process-wide OpenAI client, created on first use. The SDK's own
+    retries are off: catalog.scheduler decides when to try again.
+    """
+    import httpx
+    from openai import OpenAI
+
+    http_client = httpx.Client(
+        transport=_llm_transport(), timeout=settings.UPSTREAM_TIMEOUT
+    )
+    return OpenAI(http_client=http_client, max_retries=0)
+
+
+# ---------- prices -----------------------------------------------------------
+
+
+@lru_cache(maxsize=1)
+def price_session():
+    """
+    The process-wide curl_cffi session used by yfinance. Each thread gets its
+    own curl handle; every handle caches up to ``UPSTREAM_MAX_KEEPALIVE``
+    keep-alive connections.
+    """
+    from curl_cffi import CurlInfo, CurlOpt, requests
+
+    metrics = METRICS["prices"]
+
+    class MeteredSession(requests.Session):
+        def request(self, *args, **kwargs):
+            metrics.started()
+            try:
+                resp = super().request(*args, **kwargs)
+            except Exception:
+                metrics.finished(None)
+                raise
+            metrics.finished(bool(self.curl.getinfo(CurlInfo.NUM_CONNECTS)))
+            return resp
+
+    return MeteredSession(
+        impersonate="chrome",
+        timeout=settings.UPSTREAM_TIMEOUT,
+        curl_options={
+            CurlOpt.MAXCONNECTS: settings.UPSTREAM_MAX_KEEPALIVE,
+            CurlOpt.TCP_KEEPALIVE: 1,
+        },
+    )
+
+
+def ticker(symbol: str):
+    """A ``yfinance.Ticker`` bound to the shared price session."""
+    import yfinance as yf
+
+    return yf.Ticker(symbol, session=price_session())
+
+
+# ---------- reporting --------------------------------------------------------
+
+
+def pool_stats() -> dict:
+    """Counters for every pool, plus live pool state where available."""
+    stats = {name: m.snapshot() for name, m in METRICS.items()}
+    if _llm_transport.cache_info().currsize:
+        stats["llm"].update(_llm_transport().pool_state())
+    db = settings.DATABASES["default"]
+    stats["db"]["conn_max_age"] = db.get("CONN_MAX_AGE", 0)
+    stats["db"]["health_checks"] = db.get("CONN_HEALTH_CHECKS", False)
+    return stats
@@ -0,0 +1,293 @@
+"""
+catalog/compute.py
+Backends for the return kernel behind catalog.returns.
+
+``serial`` runs the kernel in the calling process. ``process`` spreads the
+work across a pool of worker processes in two ways:
+
+* a large block (many dates × tickers, e.g. events packed into one window)
+  has its ticker columns split across the pool. The block is written once
+  to a memory-mapped ``.npy`` file (under ``/dev/shm`` when available) and
+  workers map it read-only, so its prices are never pickled;
+* small blocks — the usual case when events are weeks or years apart and
+  every window holds a date or two — are batched into tasks of about
+  ``TASK_CELLS`` cells and those tasks run side by side, with at most
+  two per worker in flight so memory stays bounded. Each task's prices are
+  written end to end into one scratch ``.npy`` file the same way, so only
+  row offsets, dates and tickers are pickled.
+
+Only the finished cells come back. Both backends run the same kernel on the
+same float64 values, so their results are identical.
+
+If a worker dies (a crash or an OOM kill), the broken pool is discarded, the
+affected work is redone in-process, and the next call starts a fresh pool.
+
+Nothing from Django is imported here, so spawned workers start without
+loading the project.
+
+Functions
+---------
+forward_returns(values, idx, steps)                  -> (base, block)
+format_cells(isos, tickers, idx, base, block, labels) -> dict
+compute_block(values, idx, isos, tickers, steps, labels, backend, workers) -> dict
+compute_blocks(blocks, backend, workers)             -> Iterator[dict]
+get_pool(workers: int)                               -> ProcessPoolExecutor
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import tempfile
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("serial", "process")
+
+# Below this many date × ticker cells work is cheaper to do in-process, so a
+# block (or a whole study of small blocks) this small never goes to the pool
+MIN_PARALLEL_CELLS = 20_000
+# Cells per pool task when small blocks are batched together
+TASK_CELLS = 5_000
+
+
+def forward_returns(values: np.ndarray, idx: np.ndarray, steps: np.ndarray):
+    """
+    Base closes ``(dates, tickers)`` at rows *idx* of *values*, and the
+    ``(dates, tickers, horizons)`` returns *steps* rows later. NaN = unknown.
+    """
+    n = len(values)
+    rows = idx[:, None] + steps[None, :]
+    ahead = values[np.minimum(rows, n - 1)]  # (dates, horizons, tickers)
+    ahead[rows >= n] = np.nan
+    base = values[np.maximum(idx, 0)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        block = (ahead / base[:, None, :] - 1).transpose(0, 2, 1)
+    return base, block
+
+
+def format_cells(isos, tickers, idx, base, block, labels) -> dict:
+    """``results_data`` cells; dates before the data or without a base drop."""
+    results: dict = {}
+    for iso, i, base_row, cells in zip(isos, idx, base, block):
+        if i < 0:
+            continue
+        for tkr, b, cell in zip(tickers, base_row, cells):
+            if np.isnan(b):
+                continue
+            results.setdefault(iso, {})[tkr] = {
+                label: None if np.isnan(v) else float(v)
+                for label, v in zip(labels, cell)
+            }
+    return results
+
+
+def _kernel(values, idx, isos, tickers, steps, labels) -> dict:
+    base, block = forward_returns(values, idx, steps)
+    return format_cells(isos, tickers, idx, base, block, labels)
+
+
+def _columns(path, lo, hi, idx, isos, tickers, steps, labels) -> dict:
+    """Worker task: the kernel over columns ``lo:hi`` of a mapped block."""
+    values = np.load(path, mmap_mode="r")[:, lo:hi]
+    return _kernel(values, idx, isos, tickers, steps, labels)
+
+
+def _batch(blocks: list[tuple]) -> list[dict]:
+    """The kernel over several small blocks."""
+    return [_kernel(*block) for block in blocks]
+
+
+def _mapped_batch(path: str, parts: list[tuple]) -> list[dict]:
+    """
+    Worker task: :func:`_batch` over blocks packed into the mapped file at
+    *path*, each part ``(offset, shape, idx, isos, tickers, steps, labels)``.
+    """
+    flat = np.load(path, mmap_mode="r")
+    results = []
+    for offset, shape, *rest in parts:
+        values = flat[offset : offset + shape[0] * shape[1]].reshape(shape)
+        results.append(_kernel(values, *rest))
+    return results
+
+
+def _spill(task: list[tuple]) -> tuple[str, list[tuple]]:
+    """Write *task*'s price blocks end to end to a scratch file for the pool."""
+    arrays = [np.asarray(block[0], dtype="float64") for block in task]
+    path = os.path.join(_scratch_dir(), f"returns-{uuid.uuid4().hex}.npy")
+    np.save(path, np.concatenate([a.ravel() for a in arrays]))
+    offsets = np.cumsum([0] + [a.size for a in arrays[:-1]])
+    parts = [
+        (int(offset), a.shape, *block[1:])
+        for offset, a, block in zip(offsets, arrays, task)
+    ]
+    return path, parts
+
+
+def _cells(block: tuple) -> int:
+    return len(block[2]) * len(block[3])
+
+
+@lru_cache(maxsize=4)
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """A process pool per worker count, started on first use and kept."""
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def _discard_pool(pool: ProcessPoolExecutor, workers: int) -> None:
+    """Forget a broken *pool* so the next :func:`get_pool` starts a new one."""
+    pool.shutdown(wait=False, cancel_futures=True)
+    if get_pool.cache_info().currsize and get_pool(workers) is pool:
+        logger.warning("Return worker pool broke; recomputing in-process")
+        get_pool.cache_clear()
+
+
+def _scratch_dir() -> str:
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def compute_block(
+    values: np.ndarray,
+    idx: np.ndarray,
+    isos: list[str],
+    tickers: list[str],
+    steps: np.ndarray,
+    labels: list[str],
+    backend: str = "serial",
+    workers: int = 1,
+) -> dict:
+    """
+    Return cells for a ``(rows, tickers)`` float64 price block, with *idx*
+    the base row of each date in *isos*.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown returns backend: {backend}")
+    k = len(tickers)
+    if (
+        backend == "serial"
+        or workers < 2
+        or k < 2
+        or len(isos) * k < MIN_PARALLEL_CELLS
+    ):
+        return _kernel(values, idx, isos, tickers, steps, labels)
+
+    path = os.path.join(_scratch_dir(), f"returns-{uuid.uuid4().hex}.npy")
+    np.save(path, np.ascontiguousarray(values, dtype="float64"))
+    try:
+        bounds = np.linspace(0, k, min(workers, k) + 1).astype(int)
+        pool = get_pool(workers)
+        futures = [
+            pool.submit(
+                _columns, path, lo, hi, idx, isos, tickers[lo:hi], steps, labels
+            )
+            for lo, hi in zip(bounds[:-1], bounds[1:])
+        ]
+        merged: dict = {}
+        for future in futures:
+            for iso, tmap in future.result().items():
+                merged.setdefault(iso, {}).update(tmap)
+    except BrokenProcessPool:
+        _discard_pool(pool, workers)
+        return _kernel(values, idx, isos, tickers, steps, labels)
+    finally:
+        os.unlink(path)
+    return {iso: merged[iso] for iso in isos if iso in merged}
+
+
+def compute_blocks(
+    blocks: Iterable[tuple],
+    backend: str = "serial",
+    workers: int = 1,
+) -> Iterator[dict]:
+    """
+    Cells of each ``(values, idx, isos, tickers, steps, labels)`` block in
+    *blocks*, consumed lazily. Results come back in no particular order;
+    callers merge them. Large blocks go through :func:`compute_block`; small
+    ones are batched across the pool once the study has at least
+    ``MIN_PARALLEL_CELLS`` cells of them.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown returns backend: {backend}")
+    if backend == "serial" or workers < 2:
+        for block in blocks:
+            yield _kernel(*block)
+        return
+
+    pending: deque = deque()
+    batch: list[tuple] = []
+    batched = 0  # cells in *batch*
+    engaged = False  # enough small-block work seen to be worth the pool
+    try:
+        for block in blocks:
+            if _cells(block) >= MIN_PARALLEL_CELLS:
+                yield compute_block(*block, backend, workers)
+                continue
+            batch.append(block)
+            batched += _cells(block)
+            engaged = engaged or batched >= MIN_PARALLEL_CELLS
+            # Submit TASK_CELLS-sized tasks; wait for the oldest when saturated
+            while engaged and batched >= TASK_CELLS:
+                task, batch, batched = _take(batch, TASK_CELLS)
+                pending.append(_submit(workers, task))
+                while len(pending) > 2 * workers:
+                    yield from _collect(pending.popleft(), workers)
+
+        if not engaged:  # too little work to pay for the pool
+            for block in batch:
+                yield _kernel(*block)
+            return
+        if batch:
+            pending.append(_submit(workers, batch))
+        while pending:
+            yield from _collect(pending.popleft(), workers)
+    finally:  # the caller stopped early or a task failed
+        for future, _, _, path in pending:
+            if future is not None:
+                future.cancel()
+            os.unlink(path)
+
+
+def _submit(workers: int, task: list[tuple]) -> tuple:
+    pool = get_pool(workers)
+    path, parts = _spill(task)
+    try:
+        return pool.submit(_mapped_batch, path, parts), task, pool, path
+    except BrokenProcessPool:
+        _discard_pool(pool, workers)
+        return None, task, pool, path
+
+
+def _collect(pending: tuple, workers: int) -> list[dict]:
+    """A submitted task's results, recomputed in-process if the pool broke."""
+    future, task, pool, path = pending
+    try:
+        if future is not None:
+            try:
+                return future.result()
+            except BrokenProcessPool:
+                _discard_pool(pool, workers)
+        return _batch(task)
+    finally:
+        os.unlink(path)
+
+
+def _take(blocks: list[tuple], cells: int) -> tuple[list[tuple], list[tuple], int]:
+    """Leading blocks holding about *cells* cells, the rest, and its size."""
+    total = 0
+    for i, block in enumerate(blocks):
+        total += _cells(block)
+        if total >= cells:
+            rest = blocks[i + 1 :]
+            return blocks[: i + 1], rest, sum(_cells(b) for b in rest)
+    return blocks, [], 0
@@ -0,0 +1,163 @@
+"""
+catalog/export.py
+Stream analysis results as CSV, Parquet or Arrow IPC for offline research.
+
+Results are flattened to one row per post × event date × ticker × horizon::
+
+    post_id, title, mode, event_date, ticker, horizon, value
+
+Posts are read with a chunked ``.iterator()`` (a server-side cursor on
+Postgres) and encoded a batch of rows at a time. Each encoded batch is
+yielded as soon as it is written, so exporting the whole corpus holds one
+chunk of posts and one batch of rows in memory at a time. Parquet and Arrow
+need ``pyarrow``, which is optional and imported on first use.
+
+Functions
+---------
+iter_rows(posts, chunk_size=POST_CHUNK_SIZE) -> Iterator[tuple]
+stream_export(posts, fmt, chunk_size=...)    -> Iterator[bytes]
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+from datetime import date
+from itertools import islice
+from typing import Iterable, Iterator
+
+# fmt -> (content type, file extension)
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+COLUMNS = ["post_id", "title", "mode", "event_date", "ticker", "horizon", "value"]
+
+# Posts fetched per database round trip; rows encoded per yielded chunk
+POST_CHUNK_SIZE = 200
+BATCH_ROWS = 50_000
+
+
+class ExportUnavailable(Exception):
+    """The requested format needs an optional dependency that is missing."""
+
+
+def iter_rows(posts, chunk_size: int = POST_CHUNK_SIZE) -> Iterator[tuple]:
+    """Flatten the ``results_data`` of every post in *posts* (a QuerySet)."""
+    posts = posts.only("pk", "title", "mode", "results_data").order_by("pk")
+    for post in posts.iterator(chunk_size=chunk_size):
+        for iso, tmap in sorted(post.results_data.items()):
+            for tkr, hmap in tmap.items():
+                for horizon, value in hmap.items():
+                    yield post.pk, post.title, post.mode, iso, tkr, horizon, value
+
+
+def _batches(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _csv_chunks(rows, batch_rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(COLUMNS)
+    for batch in _batches(rows, batch_rows):
+        writer.writerows(batch)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+class _Drain(io.RawIOBase):
+    """Write-only sink whose contents are handed out and forgotten."""
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._parts.append(bytes(b))
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._pos
+
+    def take(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+def _arrow():
+    try:
+        import pyarrow as pa
+    except ImportError as exc:
+        raise ExportUnavailable("Parquet and Arrow exports need pyarrow.") from exc
+    return pa
+
+
+def _schema(pa):
+    return pa.schema(
+        [
+            ("post_id", pa.int64()),
+            ("title", pa.string()),
+            ("mode", pa.string()),
+            ("event_date", pa.date32()),
+            ("ticker", pa.string()),
+            ("horizon", pa.string()),
+            ("value", pa.float64()),
+        ]
+    )
+
+
+def _record_batch(pa, schema, batch):
+    columns = list(zip(*batch))
+    columns[3] = [date.fromisoformat(d) for d in columns[3]]
+    return pa.record_batch(
+        [pa.array(col, type=f.type) for col, f in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+def _arrow_chunks(pa, rows, batch_rows, fmt):
+    schema = _schema(pa)
+    sink = _Drain()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        write = writer.write_batch
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+        write = writer.write_batch
+    with writer:
+        for batch in _batches(rows, batch_rows):
+            write(_record_batch(pa, schema, batch))
+            yield sink.take()
+    yield sink.take()
+
+
+def stream_export(
+    posts,
+    fmt: str,
+    chunk_size: int = POST_CHUNK_SIZE,
+    batch_rows: int = BATCH_ROWS,
+) -> Iterator[bytes]:
+    """
+    Encoded chunks of *posts* in *fmt* (a key of ``FORMATS``). Raises
+    ``ValueError`` for unknown formats and ``ExportUnavailable`` when pyarrow
+    is needed but missing — before any output is produced.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    rows = iter_rows(posts, chunk_size)
+    if fmt == "csv":
+        return _csv_chunks(rows, batch_rows)
+    return _arrow_chunks(_arrow(), rows, batch_rows, fmt)
@@ -0,0 +1,104 @@
+"""
+catalog/extend.py
+Grow an existing analysis with more event dates or tickers, computing only
+the cells that are new.
+
+For a study over dates D and tickers T, adding dates D' and tickers T'
+needs exactly two rectangular blocks::
+
+    D' × (T ∪ T')    and    D × T'
+
+Prices come through the cached fetchers, and the stored aggregates are
+updated by folding in the new cells, so an extension costs O(new cells).
+
+Functions
+---------
+new_blocks(dates, tickers, new_dates, new_tickers) -> list[tuple]
+extend_analysis(post, new_dates, new_tickers, times=None) -> int
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+from django.db import transaction
+
+from catalog.models import AnalysisPost
+from catalog.results import aggregate, merge_cells
+from catalog.returns import daily_event_returns
+
+
+def new_blocks(
+    dates: list[str],
+    tickers: list[str],
+    new_dates: list[str],
+    new_tickers: list[str],
+) -> list[tuple[list[str], list[str]]]:
+    """The (dates, tickers) blocks that hold every not-yet-computed cell."""
+    added_dates = [d for d in dict.fromkeys(new_dates) if d not in dates]
+    added_tickers = [t for t in dict.fromkeys(new_tickers) if t not in tickers]
+    blocks = []
+    if added_dates:
+        blocks.append((added_dates, [*tickers, *added_tickers]))
+    if dates and added_tickers:
+        blocks.append((list(dates), added_tickers))
+    return blocks
+
+
+def _compute(post: AnalysisPost, dates: list[str], tickers: list[str], times):
+    if post.mode == AnalysisPost.INTRADAY:
+        from catalog.intraday import event_timestamp, intraday_event_returns
+
+        stamps = [event_timestamp(d, times.get(d)) for d in dates]
+        return intraday_event_returns(stamps, tickers)
+    return daily_event_returns([date.fromisoformat(d) for d in dates], tickers)
+
+
+def study_axes(post: AnalysisPost) -> tuple[list[str], list[str]]:
+    """Dates and tickers the stored results were computed for."""
+    dates = sorted(post.results_data)
+    tickers = sorted({t for tmap in post.results_data.values() for t in tmap})
+    return dates, tickers
+
+
+def extend_analysis(
+    post: AnalysisPost,
+    new_dates: list[str],
+    new_tickers: list[str],
+    times: dict | None = None,
+) -> int:
+    """
+    Add *new_dates* (ISO) and *new_tickers* to *post*, computing only the
+    missing cells. Returns the number of cells added. *times* maps ISO dates
+    to ``HH:MM`` event times for intraday studies.
+    """
+    times = times or {}
+    for ev in post.events_data:
+        times.setdefault(ev["date"], ev.get("time"))
+    dates, tickers = study_axes(post)
+
+    cells: dict = {}
+    for block_dates, block_tickers in new_blocks(
+        dates, tickers, new_dates, new_tickers
+    ):
+        for iso, tmap in _compute(post, block_dates, block_tickers, times).items():
+            cells.setdefault(iso, {}).update(tmap)
+    if not cells:
+        return 0
+
+    with transaction.atomic():
+        locked = AnalysisPost.objects.select_for_update().get(pk=post.pk)
+        results = locked.results_data
+        aggregates = locked.aggregates or aggregate(results)
+        added = {}
+        for iso, tmap in cells.items():
+            for tkr, hmap in tmap.items():
+                if tkr not in results.get(iso, {}):  # a concurrent extend won
+                    results.setdefault(iso, {})[tkr] = hmap
+                    added.setdefault(iso, {})[tkr] = hmap
+        locked.aggregates = merge_cells(aggregates, added)
+        locked.save(update_fields=["results_data", "aggregates", "updated_at"])
+
+    post.results_data = locked.results_data
+    post.aggregates = locked.aggregates
+    return sum(len(tmap) for tmap in added.values())
@@ -0,0 +1,226 @@
+"""
+catalog/intraday.py
+Returns at minutes-to-hours horizons after timestamped events, from
+intraday bars.
+
+Bars are cached per ticker × interval × session day as two columns — bar
+end time (int64 ns, UTC) and close (float32) — in ``.npy`` files under
+``INTRADAY_CACHE_DIR``. That is 12 bytes per bar against ~50 for a pandas
+OHLCV frame, and repeat studies never touch the network. Files are read
+whole rather than memory-mapped: a session is ~1 KB, and every cached map
+would keep a file descriptor open. Each session starts with an extra row
+at the opening bell holding the first bar's open, so events before the
+first bar closes (the default 09:30) still have a base price. Yahoo only
+serves 1m bars for the last 30 days and 5m bars for the last 60, so older
+events come back empty.
+
+Only regular-session bars are fetched, so an event outside 09:30–16:00 ET
+(pre-market CPI, after-close earnings, a weekend announcement) is measured
+from the next opening bell: the same day's open before 09:30, otherwise the
+next weekday's. Results stay keyed by the event's own date. If that next
+weekday is a market holiday there are no bars and the event is left out.
+
+Functions
+---------
+session_bars(symbol: str, day: date, interval: str) -> (ndarray, ndarray)
+reaction_start(event: datetime)                      -> datetime
+intraday_event_returns(events, tickers, interval=None) -> dict
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from django.conf import settings
+
+from catalog.clients import ticker
+from catalog.scheduler import get_scheduler
+
+MARKET_TZ = ZoneInfo("America/New_York")
+SESSION_OPEN = time(9, 30)
+SESSION_CLOSE = time(16, 0)
+
+# Offsets after the event; "EOD" is the session's last close
+INTRADAY_HORIZONS = {"5m": 5, "30m": 30, "1h": 60}
+EOD = "EOD"
+
+_BAR_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30}
+_NS_PER_MIN = 60 * 10**9
+
+# Bumped when the on-disk layout changes; older files are ignored
+_CACHE_VERSION = 2
+
+
+def _cache_dir() -> Path:
+    return Path(settings.INTRADAY_CACHE_DIR)
+
+
+def _paths(symbol: str, day: date, interval: str) -> tuple[Path, Path]:
+    base = _cache_dir() / f"v{_CACHE_VERSION}" / interval / symbol / day.isoformat()
+    return base.with_suffix(".ts.npy"), base.with_suffix(".close.npy")
+
+
+def _ns(dt: datetime) -> int:
+    return int(dt.timestamp()) * 10**9
+
+
+def _session_bounds(day: date) -> tuple[int, int]:
+    open_ = datetime.combine(day, SESSION_OPEN, MARKET_TZ)
+    close = datetime.combine(day, SESSION_CLOSE, MARKET_TZ)
+    return _ns(open_), _ns(close)
+
+
+def _fetch(symbol: str, day: date, interval: str) -> tuple[np.ndarray, np.ndarray]:
+    hist = get_scheduler().call(
+        "prices",
+        ticker(symbol).history,
+        start=day,
+        end=day + timedelta(days=1),
+        interval=interval,
+        prepost=False,
+        auto_adjust=True,
+    )
+    if "Close" not in hist or "Open" not in hist or hist.empty:
+        return np.empty(0, "int64"), np.empty(0, "float32")
+    # Yahoo stamps bars with their start; we key them by when they close,
+    # after an opening row carrying the first bar's open
+    starts = hist.index.tz_convert("UTC").asi8
+    ends = starts + _BAR_MINUTES[interval] * _NS_PER_MIN
+    ts = np.concatenate([[_session_bounds(day)[0]], ends]).astype("int64")
+    close = np.concatenate([[hist["Open"].iloc[0]], hist["Close"].to_numpy()])
+    return ts, close.astype("float32")
+
+
+class _NoBars(Exception):
+    """Raised instead of returning empty bars, so lru_cache keeps no entry."""
+
+
+@lru_cache(maxsize=4096)
+def _past_session(symbol: str, day: date, interval: str):
+    ts_path, close_path = _paths(symbol, day, interval)
+    if ts_path.exists() and close_path.exists():
+        return _read_only(np.load(ts_path), np.load(close_path))
+
+    ts, close = _fetch(symbol, day, interval)
+    if not len(ts):  # no data yet, or a transient error Yahoo swallowed
+        raise _NoBars
+    ts_path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(ts_path, ts)
+    np.save(close_path, close)
+    return _read_only(ts, close)
+
+
+def _read_only(ts: np.ndarray, close: np.ndarray):
+    ts.flags.writeable = False
+    close.flags.writeable = False
+    return ts, close
+
+
+def session_bars(symbol: str, day: date, interval: str):
+    """
+    ``(bar_end_ns, close)`` for one regular session, read-only. Past
+    sessions with bars are cached in memory and on disk after the first
+    fetch; today's (still growing) session and empty results are not.
+    """
+    if day >= datetime.now(MARKET_TZ).date():
+        return _read_only(*_fetch(symbol, day, interval))
+    try:
+        return _past_session(symbol, day, interval)
+    except _NoBars:
+        return _read_only(np.empty(0, "int64"), np.empty(0, "float32"))
+
+
+def _ticker_returns(symbol: str, events: list[datetime], interval: str) -> np.ndarray:
+    """(n_events, n_horizons + 1) returns for one ticker; NaN when unknown."""
+    days = [e.astimezone(MARKET_TZ).date() for e in events]
+    sessions = sorted(set(days))
+    bars = [session_bars(symbol, d, interval) for d in sessions]
+    sizes = np.array([len(ts) for ts, _ in bars])
+    if not sizes.any():
+        return np.full((len(events), len(INTRADAY_HORIZONS) + 1), np.nan)
+
+    # One flat, sorted column pair covering every event session
+    ts = np.concatenate([b[0] for b in bars])
+    close = np.concatenate([b[1] for b in bars]).astype("float64")
+    pos = np.searchsorted(
+        np.array(sessions, dtype="datetime64[D]"), np.array(days, dtype="datetime64[D]")
+    )
+    stops = np.cumsum(sizes)[pos]
+    counts = sizes[pos]
+    starts = stops - counts
+
+    bounds = np.array([_session_bounds(d) for d in days], dtype="int64")
+    event_ns = np.array([_ns(e) for e in events], dtype="int64")
+    offsets = np.array(list(INTRADAY_HORIZONS.values()), dtype="int64") * _NS_PER_MIN
+
+    # Base: last close (or the opening row) at/before the event, same session
+    base_i = np.searchsorted(ts, event_ns, side="right") - 1
+    has_base = (counts > 0) & (base_i >= starts) & (base_i < stops)
+
+    targets = event_ns[:, None] + offsets[None, :]
+    tgt_i = np.searchsorted(ts, targets, side="right") - 1
+    in_session = (targets <= bounds[:, 1:2]) & (tgt_i >= starts[:, None])
+    last_i = np.maximum(stops - 1, 0)
+    tgt_i = np.minimum(tgt_i, last_i[:, None])
+    all_i = np.concatenate([tgt_i, last_i[:, None]], axis=1)
+    valid = np.concatenate([in_session, np.ones((len(events), 1), bool)], axis=1)
+    valid &= has_base[:, None]
+
+    base = close[np.clip(base_i, 0, len(close) - 1)]
+    out = close[all_i] / base[:, None] - 1
+    out[~valid] = np.nan
+    return out
+
+
+def reaction_start(event: datetime) -> datetime:
+    """
+    When the market can first react to *event*: the event itself during
+    regular hours, otherwise the next opening bell.
+    """
+    local = event.astimezone(MARKET_TZ)
+    day = local.date()
+    if day.weekday() < 5 and local.time() < SESSION_CLOSE:
+        if local.time() >= SESSION_OPEN:
+            return event
+        return datetime.combine(day, SESSION_OPEN, MARKET_TZ)
+    day += timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return datetime.combine(day, SESSION_OPEN, MARKET_TZ)
+
+
+def intraday_event_returns(
+    events: list[datetime], tickers: list[str], interval: str | None = None
+) -> dict:
+    """
+    Returns at +5m, +30m, +1h and the session close after each (tz-aware)
+    event timestamp, in the ``results_data`` layout keyed by event date.
+    Events outside regular hours count from :func:`reaction_start`. Events
+    with no bars for a ticker are left out.
+    """
+    interval = interval or settings.INTRADAY_INTERVAL
+    events = sorted(events)
+    starts = [reaction_start(e) for e in events]
+    labels = [*INTRADAY_HORIZONS, EOD]
+    results: dict = {}
+    for tkr in tickers:
+        matrix = _ticker_returns(tkr, starts, interval)
+        for event, row in zip(events, matrix):
+            if np.isnan(row).all():
+                continue
+            iso = event.astimezone(MARKET_TZ).date().isoformat()
+            results.setdefault(iso, {})[tkr] = {
+                label: None if np.isnan(v) else float(v)
+                for label, v in zip(labels, row)
+            }
+    return results
+
+
+def event_timestamp(iso: str, hhmm: str | None) -> datetime:
+    """Event time in market time; defaults to the opening bell."""
+    t = time.fromisoformat(hhmm) if hhmm else SESSION_OPEN
+    return datetime.combine(date.fromisoformat(iso), t, MARKET_TZ)
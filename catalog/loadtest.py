@@ -0,0 +1,473 @@
+"""
+catalog/loadtest.py
+Load-test harness: local stub upstreams and simulated wizard users.
+
+The stubs stand in for the two upstreams, each on its own
+ThreadingHTTPServer in a daemon thread, with configurable latency, jitter
+and error rate (errors are 503s, which the scheduler retries):
+
+* ``StubLLM`` serves an OpenAI-compatible ``/v1/chat/completions``. It
+  recognises the wizard's prompts (dates, tickers, one-shot, summaries) and
+  answers each in the format the prompt asks for. Point ``OPENAI_BASE_URL``
+  at ``{url}/v1``.
+* ``StubPrices`` speaks the ``PRICE_SERVICE_URL`` protocol of
+  catalog/prices.py. Closes are deterministic random walks per symbol.
+
+``run_load`` has every simulated user log in over HTTP and then repeat the
+three-step ``chat_flow`` POST sequence followed by ``analysis_detail`` and
+``analysis_list`` reads. Each request is timed per endpoint, and
+``summarize`` turns the samples into throughput, latency percentiles and
+error rates.
+
+Functions
+---------
+run_load(base_url, usernames, password, iterations=1, duration=None,
+         think_time=0.0, seed=0)          -> (list[Sample], float)
+summarize(samples, wall_seconds)         -> dict
+format_report(report)                    -> str
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+# Tier-1 symbols from the ticker index, so screening keeps the stub's picks
+STUB_SYMBOLS = [
+    "AAPL",
+    "MSFT",
+    "JPM",
+    "XOM",
+    "CVX",
+    "LMT",
+    "BA",
+    "WMT",
+    "KO",
+    "SPY",
+    "GLD",
+    "TLT",
+]
+TOPICS = [
+    "Fed rate hikes",
+    "Oil supply shocks",
+    "Brexit referendum and aftermath",
+    "US-China trade war tariff announcements",
+    "Major hurricane landfalls on the Gulf Coast",
+    "Apple product launch events",
+    "European sovereign debt crisis",
+    "OPEC production cuts",
+]
+
+# Endpoint labels in report order
+ENDPOINTS = [
+    "login",
+    "chat:start",
+    "chat:topic",
+    "chat:dates",
+    "chat:stocks",
+    "analysis_detail",
+    "analysis_list",
+]
+
+_WALK_START = np.datetime64("2000-01-03")
+_WALK_END = np.datetime64("2031-01-01")
+
+
+# ---------- stub servers -----------------------------------------------------
+
+
+class _StubServer:
+    """A JSON-over-HTTP stub on 127.0.0.1 with injected latency and errors."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        port: int = 0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name=type(self).__name__, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _draw(self) -> tuple[float, bool]:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._rng.uniform(-self.jitter, self.jitter)
+            return max(delay, 0.0), self._rng.random() < self.error_rate
+
+    def respond(self, method: str, path: str, query: dict, body: dict):
+        """(status, JSON payload) for one request."""
+        raise NotImplementedError
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                delay, fail = stub._draw()
+                time.sleep(delay)
+                if fail:
+                    status, payload = 503, {"error": {"message": "stub overloaded"}}
+                else:
+                    parts = urlsplit(self.path)
+                    query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                    body = json.loads(raw) if raw else {}
+                    status, payload = stub.respond(method, parts.path, query, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if status == 503:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def _topic_rng(text: str) -> random.Random:
+    # Same topic, same answer — like a model at temperature 0
+    return random.Random(zlib.crc32(text.encode("utf-8")))
+
+
+def _stub_dates(rng: random.Random, n: int) -> list[str]:
+    days = set()
+    for _ in range(n):
+        d = date(2012, 1, 2) + timedelta(days=rng.randrange(12 * 365))
+        days.add(d + timedelta(days=(7 - d.weekday()) % 7 if d.weekday() > 4 else 0))
+    return [d.isoformat() for d in sorted(days)]
+
+
+def _stub_stocks(rng: random.Random, per_side: int) -> dict:
+    picks = rng.sample(STUB_SYMBOLS, 2 * per_side)
+    return {"positive": picks[:per_side], "negative": picks[per_side:]}
+
+
+class StubLLM(_StubServer):
+    """OpenAI-compatible chat completions for the wizard's prompts."""
+
+    def respond(self, method, path, query, body):
+        if method != "POST" or not path.endswith("/chat/completions"):
+            return 404, {"error": {"message": f"no route {path}"}}
+        prompt = body["messages"][-1]["content"]
+        rng = _topic_rng(prompt)
+        if "significant dates" in prompt and "tickers" in prompt:
+            content = json.dumps(
+                {
+                    "confirmed": True,
+                    "events": [
+                        {"date": d, "description": f"Stub event on {d}."}
+                        for d in _stub_dates(rng, rng.randint(3, 6))
+                    ],
+                    "stocks": _stub_stocks(rng, 3),
+                    "message": "stub",
+                }
+            )
+        elif "significant dates" in prompt:
+            content = json.dumps(
+                {
+                    "confirmed": True,
+                    "events": _stub_dates(rng, rng.randint(3, 6)),
+                    "message": "stub",
+                }
+            )
+        elif "tickers" in prompt:
+            content = json.dumps({"stocks": _stub_stocks(rng, 3), "message": "stub"})
+        else:
+            content = "A stub account of what happened on that date."
+        return 200, {
+            "id": f"chatcmpl-stub{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+
+class StubPrices(_StubServer):
+    """The catalog.prices service protocol over deterministic random walks."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._walks: dict[str, np.ndarray] = {}
+        self._days = np.arange(_WALK_START, _WALK_END)
+        self._days = self._days[np.is_busday(self._days)]
+
+    def _walk(self, symbol: str) -> np.ndarray:
+        walk = self._walks.get(symbol)
+        if walk is None:
+            rng = np.random.default_rng(zlib.crc32(symbol.encode("utf-8")))
+            steps = rng.normal(0.0003, 0.015, len(self._days))
+            walk = self._walks[symbol] = 100 * np.exp(steps.cumsum())
+        return walk
+
+    def respond(self, method, path, query, body):
+        parts = path.strip("/").split("/")
+        if method == "GET" and len(parts) == 2 and parts[0] == "closes":
+            lo, hi = np.searchsorted(
+                self._days,
+                [np.datetime64(query["start"]), np.datetime64(query["end"])],
+            )
+            return 200, {
+                "dates": [str(d) for d in self._days[lo:hi]],
+                "closes": self._walk(parts[1])[lo:hi].round(4).tolist(),
+            }
+        if method == "GET" and len(parts) == 2 and parts[0] == "info":
+            return 200, {
+                "longName": f"{parts[1]} (stub)",
+                "longBusinessSummary": "Stub company used for load tests.",
+            }
+        return 404, {"error": f"no route {path}"}
+
+
+# ---------- simulated users --------------------------------------------------
+
+_EVENTS_RE = re.compile(r'name="events" value="([^"]+)"')
+_STOCKS_RE = re.compile(r'name="stocks"\s+value="([^"]+)"')
+_DETAIL_RE = re.compile(r"/analysis/(\d+)/$")
+
+
+@dataclass(frozen=True, slots=True)
+class Sample:
+    endpoint: str
+    seconds: float
+    ok: bool
+    status: int  # 0 when the request itself failed
+
+
+class SimulatedUser:
+    """One logged-in browser session driving the wizard over HTTP."""
+
+    def __init__(self, base_url, username, password, samples, rng, think_time=0.0):
+        import httpx
+
+        self.client = httpx.Client(base_url=base_url, timeout=300.0)
+        self.username = username
+        self.password = password
+        self.samples = samples
+        self.rng = rng
+        self.think_time = think_time
+
+    def _request(self, endpoint, method, path, expect, check=None, **kwargs):
+        headers = {"X-CSRFToken": self.client.cookies.get("csrftoken", "")}
+        t0 = time.perf_counter()
+        try:
+            resp = self.client.request(method, path, headers=headers, **kwargs)
+        except Exception:
+            self.samples.append(Sample(endpoint, time.perf_counter() - t0, False, 0))
+            return None
+        elapsed = time.perf_counter() - t0
+        ok = resp.status_code == expect and (check is None or check(resp))
+        self.samples.append(Sample(endpoint, elapsed, ok, resp.status_code))
+        return resp if ok else None
+
+    def _think(self):
+        if self.think_time:
+            time.sleep(self.rng.uniform(0, self.think_time))
+
+    def login(self) -> bool:
+        self.client.get("/accounts/login/")
+        resp = self._request(
+            "login",
+            "POST",
+            "/accounts/login/",
+            302,
+            data={"username": self.username, "password": self.password},
+        )
+        return resp is not None
+
+    def run_wizard(self) -> int | None:
+        """One topic → dates → stocks pass; the new analysis's pk or None."""
+        if not self._request("chat:start", "GET", "/chat/", 200):
+            return None
+        topic = f"{self.rng.choice(TOPICS)} #{self.rng.randrange(10**6)}"
+        resp = self._request(
+            "chat:topic",
+            "POST",
+            "/chat/",
+            200,
+            lambda r: _EVENTS_RE.search(r.text),
+            data={"query": topic, "force": "1"},
+        )
+        if resp is None:
+            return None
+        events = _EVENTS_RE.findall(resp.text)
+        self._think()
+        resp = self._request(
+            "chat:dates",
+            "POST",
+            "/chat/",
+            200,
+            lambda r: _STOCKS_RE.search(r.text),
+            data={"events": events},
+        )
+        if resp is None:
+            return None
+        stocks = _STOCKS_RE.findall(resp.text)
+        self._think()
+        resp = self._request(
+            "chat:stocks",
+            "POST",
+            "/chat/",
+            302,
+            lambda r: _DETAIL_RE.search(r.headers.get("location", "")),
+            data={"stocks": stocks},
+        )
+        if resp is None:
+            return None
+        return int(_DETAIL_RE.search(resp.headers["location"]).group(1))
+
+    def browse(self, pk: int | None) -> None:
+        if pk is not None:
+            self._request("analysis_detail", "GET", f"/analysis/{pk}/", 200)
+        self._request("analysis_list", "GET", "/analysis/", 200)
+
+
+def run_load(
+    base_url: str,
+    usernames: list[str],
+    password: str,
+    iterations: int = 1,
+    duration: float | None = None,
+    think_time: float = 0.0,
+    seed: int = 0,
+) -> tuple[list[Sample], float]:
+    """
+    Drive one concurrent session per username for *iterations* wizard
+    passes each (or until *duration* seconds have passed). Returns every
+    timed request and the wall time.
+    """
+    samples: list[Sample] = []  # list.append is atomic
+    deadline = None if duration is None else time.monotonic() + duration
+
+    def session(i, username):
+        user = SimulatedUser(
+            base_url, username, password, samples, random.Random(seed + i), think_time
+        )
+        try:
+            if not user.login():
+                return
+            n = 0
+            while (deadline is None and n < iterations) or (
+                deadline is not None and time.monotonic() < deadline
+            ):
+                user.browse(user.run_wizard())
+                n += 1
+        finally:
+            user.client.close()
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(len(usernames), 1)) as pool:
+        list(pool.map(session, range(len(usernames)), usernames))
+    return samples, time.perf_counter() - t0
+
+
+# ---------- reporting --------------------------------------------------------
+
+
+def summarize(samples: list[Sample], wall_seconds: float) -> dict:
+    """Per-endpoint counts, error rate, throughput and latency percentiles."""
+    report = {"wall_seconds": wall_seconds, "endpoints": {}}
+    names = ENDPOINTS + sorted({s.endpoint for s in samples} - set(ENDPOINTS))
+    for name in names:
+        mine = [s for s in samples if s.endpoint == name]
+        if not mine:
+            continue
+        ms = np.array([s.seconds for s in mine]) * 1000
+        errors = sum(not s.ok for s in mine)
+        p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+        report["endpoints"][name] = {
+            "requests": len(mine),
+            "errors": errors,
+            "error_rate": errors / len(mine),
+            "rps": len(mine) / wall_seconds if wall_seconds else 0.0,
+            "p50_ms": float(p50),
+            "p90_ms": float(p90),
+            "p99_ms": float(p99),
+            "max_ms": float(ms.max()),
+        }
+    done = report["endpoints"].get("chat:stocks", {})
+    completed = done.get("requests", 0) - done.get("errors", 0)
+    report["wizards_completed"] = completed
+    report["wizards_per_minute"] = 60 * completed / wall_seconds if wall_seconds else 0
+    return report
+
+
+def format_report(report: dict) -> str:
+    """Fixed-width table of a ``summarize`` report."""
+    lines = [
+        f"{'endpoint':<17}{'reqs':>6}{'err%':>7}{'req/s':>8}"
+        f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    ]
+    for name, row in report["endpoints"].items():
+        lines.append(
+            f"{name:<17}{row['requests']:>6}{row['error_rate']:>7.1%}"
+            f"{row['rps']:>8.2f}{row['p50_ms']:>9.0f}{row['p90_ms']:>9.0f}"
+            f"{row['p99_ms']:>9.0f}{row['max_ms']:>9.0f}"
+        )
+    lines.append(
+        f"{report['wizards_completed']} wizard runs completed in "
+        f"{report['wall_seconds']:.1f}s ({report['wizards_per_minute']:.1f}/min)"
+    )
+    return "\n".join(lines)
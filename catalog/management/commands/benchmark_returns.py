@@ -0,0 +1,144 @@
+"""
+manage.py benchmark_returns [--events N] [--tickers N] [--years N] [--workers 1,2,4]
+                           [--layouts dense,sparse]
+
+Time daily event returns on synthetic prices, in-process and on the process
+pool, and check every run matches the serial result. Two event layouts are
+timed: ``dense`` packs the events weeks apart so their windows merge into a
+few large blocks; ``sparse`` spaces them more than a window apart (at most
+one event per ``SPARSE_SPACING`` days), so every block holds a single date,
+as in most real studies. Random-walk closes are
+seeded into the price cache first, so nothing goes over the network and
+the timings cover exactly what chat_flow's step 3 does after a cache hit.
+"""
+
+import os
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.compute import get_pool
+from catalog.prices import store_closes
+from catalog.returns import daily_event_returns
+
+# Days between sparse events: more than WINDOW_BEFORE + WINDOW_AFTER
+SPARSE_SPACING = 90
+
+
+class Command(BaseCommand):
+    help = "Benchmark the serial and process-pool return backends."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=500)
+        parser.add_argument("--tickers", type=int, default=200)
+        parser.add_argument("--years", type=int, default=30)
+        parser.add_argument(
+            "--workers",
+            default=",".join(
+                str(w) for w in (1, 2, 4, 8, 16) if w <= (os.cpu_count() or 1)
+            )
+            or "1",
+            help="Comma-separated pool sizes to time (default: up to the cores).",
+        )
+        parser.add_argument("--repeat", type=int, default=3, help="Best of N runs.")
+        parser.add_argument("--memory-limit-mb", type=int, default=None)
+        parser.add_argument(
+            "--layouts", default="dense,sparse", help="Event layouts to time."
+        )
+
+    def _seed(self, n_tickers, years):
+        import numpy as np
+        import pandas as pd
+
+        end = date.today().replace(month=1, day=1) - timedelta(days=1)
+        start = end.replace(year=end.year - years + 1, month=1, day=1)
+        days = pd.bdate_range(start, end)
+        rng = np.random.default_rng(0)
+        tickers = [f"BENCH{i:04d}" for i in range(n_tickers)]
+        for tkr in tickers:
+            steps = rng.normal(0.0003, 0.015, len(days))
+            store_closes(tkr, pd.Series(100 * np.exp(steps.cumsum()), index=days))
+        return tickers, start, end
+
+    def _time(self, dates, tickers, repeat, **kwargs):
+        """Best of *repeat* runs by compute time, plus one traced for peak memory."""
+        best, result = None, None
+        for _ in range(repeat):
+            stats = {}
+            result = daily_event_returns(dates, tickers, stats=stats, **kwargs)
+            if best is None or stats["compute_seconds"] < best["compute_seconds"]:
+                best = stats
+        traced = {}
+        daily_event_returns(dates, tickers, stats=traced, trace_memory=True, **kwargs)
+        best["peak_bytes"] = traced["peak_bytes"]
+        return best, result
+
+    def _row(self, label, stats, serial, identical):
+        speedup = serial["compute_seconds"] / stats["compute_seconds"]
+        workers = int(label.split("×")[1]) if "×" in label else 1
+        self.stdout.write(
+            f"{label:<12}{stats['load_seconds']:>8.3f}{stats['compute_seconds']:>10.3f}"
+            f"{speedup:>9.2f}{speedup / workers:>7.0%}"
+            f"{stats['peak_bytes'] / 2**20:>9.1f}  {identical}"
+        )
+
+    def handle(self, *args, **opts):
+        try:
+            workers = [int(w) for w in opts["workers"].split(",") if w.strip()]
+        except ValueError:
+            raise CommandError("--workers takes comma-separated integers.")
+        limit = opts["memory_limit_mb"]
+        limit = limit * 2**20 if limit else None
+
+        layouts = [x.strip() for x in opts["layouts"].split(",") if x.strip()]
+        if not set(layouts) <= {"dense", "sparse"}:
+            raise CommandError("--layouts takes dense and/or sparse.")
+
+        tickers, start, end = self._seed(opts["tickers"], opts["years"])
+        for layout in layouts:
+            dates = self._dates(layout, opts["events"], start, end)
+            self.stdout.write(
+                f"\n{layout}: {len(dates)} events × {len(tickers)} tickers, "
+                f"{start.year}–{end.year}, {os.cpu_count()} cores"
+            )
+            self._compare(dates, tickers, workers, opts["repeat"], limit)
+
+    def _dates(self, layout, n, start, end):
+        last = end - timedelta(days=90)
+        span = (last - start).days
+        step = max(span // max(n, 1), 1)
+        if layout == "sparse":
+            step = max(step, SPARSE_SPACING)
+            n = min(n, span // step + 1)
+        return [start + timedelta(days=30 + step * i) for i in range(n)]
+
+    def _compare(self, dates, tickers, workers, repeat, limit):
+        serial, expected = self._time(
+            dates, tickers, repeat, memory_limit=limit, backend="serial"
+        )
+        self.stdout.write(
+            f"{'backend':<12}{'load s':>8}{'compute s':>10}{'speedup':>9}{'eff.':>7}"
+            f"{'peak MB':>9}  identical"
+        )
+        self._row("serial", serial, serial, "-")
+        for w in workers:
+            list(get_pool(w).map(abs, range(w)))  # start the pool untimed
+            stats, result = self._time(
+                dates,
+                tickers,
+                repeat,
+                memory_limit=limit,
+                backend="process",
+                workers=w,
+            )
+            self._row(
+                f"process×{w}", stats, serial, "yes" if result == expected else "NO"
+            )
+
+        cells = sum(len(t) for t in expected.values())
+        self.stdout.write(
+            f"{cells} cells; {serial['windows']} windows, {serial['chunks']} blocks. "
+            "Speedup is of the compute phase; loading cached prices stays in this "
+            "process, and pooled work that overlaps loading counts as load time. "
+            "Peak memory is traced in this process only."
+        )
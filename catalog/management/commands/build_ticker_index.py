@@ -0,0 +1,85 @@
+"""
+manage.py build_ticker_index [SYMBOL ...] [--output PATH] [--tier N]
+
+Refresh the ticker universe CSV read by catalog.tickers. Listing dates,
+exchange and name come from Yahoo's chart metadata; ``delisted``, ``tier``
+and ``former`` are curated by hand and kept from the existing file.
+"""
+
+import csv
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from catalog.tickers import CSV_COLUMNS, DEFAULT_INDEX_PATH
+
+# Yahoo exchange codes -> the names used in the CSV
+_EXCHANGES = {
+    "NMS": "NASDAQ",
+    "NGM": "NASDAQ",
+    "NCM": "NASDAQ",
+    "NYQ": "NYSE",
+    "PCX": "NYSEARCA",
+    "ASE": "NYSEAMERICAN",
+    "BTS": "CBOE",
+}
+
+
+class Command(BaseCommand):
+    help = "Refresh listing metadata in the ticker universe CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "symbols",
+            nargs="*",
+            help="Symbols to add or refresh (default: every row in the file).",
+        )
+        parser.add_argument("--output", help="CSV to write (default: the index).")
+        parser.add_argument(
+            "--tier", type=int, default=2, help="Liquidity tier for new symbols."
+        )
+
+    def handle(self, *args, **opts):
+        import yfinance as yf
+
+        source = Path(
+            getattr(settings, "TICKER_INDEX_PATH", None) or DEFAULT_INDEX_PATH
+        )
+        output = Path(opts["output"] or source)
+
+        rows = {}
+        if source.exists():
+            with open(source, newline="", encoding="utf-8") as fh:
+                rows = {row["symbol"]: row for row in csv.DictReader(fh)}
+
+        symbols = [s.upper() for s in opts["symbols"]] or list(rows)
+        for sym in symbols:
+            row = rows.setdefault(
+                sym,
+                {col: "" for col in CSV_COLUMNS} | {"symbol": sym},
+            )
+            row["tier"] = row["tier"] or str(opts["tier"])
+            try:
+                tk = yf.Ticker(sym)
+                tk.history(period="5d")
+                meta = tk.history_metadata or {}
+            except Exception as exc:
+                self.stderr.write(f"{sym}: {exc}")
+                continue
+
+            first = meta.get("firstTradeDate")
+            if first:
+                listed = datetime.fromtimestamp(first, tz=timezone.utc).date()
+                row["listed"] = listed.isoformat()
+            code = meta.get("exchangeName")
+            row["exchange"] = _EXCHANGES.get(code, code) or row["exchange"]
+            row["name"] = meta.get("longName") or meta.get("shortName") or row["name"]
+            self.stdout.write(f"{sym}: listed {row['listed'] or '?'}")
+
+        with open(output, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(fh, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows.values())
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(rows)} symbols to {output}"))
@@ -0,0 +1,74 @@
+"""
+manage.py export_results [--format csv|parquet|arrow] [--ids 1,2,…] [--output PATH]
+
+Write analysis results in the long layout of catalog.export — one row per
+post × event date × ticker × horizon — to a file or stdout, in constant
+memory.
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.export import (
+    BATCH_ROWS,
+    FORMATS,
+    POST_CHUNK_SIZE,
+    ExportUnavailable,
+    stream_export,
+)
+from catalog.models import AnalysisPost
+
+
+class Command(BaseCommand):
+    help = "Export analysis results as CSV, Parquet or Arrow IPC."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument(
+            "--ids", help="Comma-separated post ids (default: every analysis)."
+        )
+        parser.add_argument("--output", default="-", help="File to write; - = stdout.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=POST_CHUNK_SIZE,
+            help="Posts fetched per database round trip.",
+        )
+        parser.add_argument(
+            "--batch-rows",
+            type=int,
+            default=BATCH_ROWS,
+            help="Rows encoded per output chunk.",
+        )
+
+    def handle(self, *args, **opts):
+        posts = AnalysisPost.objects.exclude(results_data={})
+        if opts["ids"]:
+            try:
+                ids = [int(i) for i in opts["ids"].split(",") if i.strip()]
+            except ValueError:
+                raise CommandError("--ids takes comma-separated integers.")
+            posts = posts.filter(pk__in=ids)
+
+        try:
+            chunks = stream_export(
+                posts, opts["format"], opts["chunk_size"], opts["batch_rows"]
+            )
+        except ExportUnavailable as exc:
+            raise CommandError(str(exc))
+
+        to_stdout = opts["output"] == "-"
+        out = sys.stdout.buffer if to_stdout else open(opts["output"], "wb")
+        written = 0
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if not to_stdout:
+                out.close()
+        if not to_stdout:
+            self.stdout.write(
+                self.style.SUCCESS(f"Wrote {written} bytes to {opts['output']}")
+            )
@@ -0,0 +1,227 @@
+"""
+manage.py loadtest [--users N] [--iterations N | --duration S] [--target URL]
+                   [--llm-rate R] [--price-rate R]
+
+Drive the analysis wizard with simulated users against stub upstreams and
+report throughput, latency percentiles and error rates per endpoint.
+
+Without ``--target`` the app is served in this process on a threaded WSGI
+server. Its LLM and price clients are pointed at the stubs, so nothing
+leaves the machine. With ``--target`` the stubs are started on the given
+ports and the deployment at URL is driven instead; run it with the printed
+``OPENAI_BASE_URL`` / ``PRICE_SERVICE_URL`` and the same database so the
+simulated users can log in.
+
+Upstream calls still go through the scheduler's token buckets
+(``UPSTREAM_RATE_LIMITS``, 2 price requests/second by default), which can
+cap throughput long before the app does. ``--llm-rate`` / ``--price-rate``
+override the requests/second for the run (the burst is kept), and the
+report prints the limits that were in force.
+
+The simulated users are temporary accounts (``loadtest-<run>-<n>``) with a
+random password unless ``--password`` is given. They are created in the
+configured database and deleted, together with every analysis they made,
+when the run ends. The command refuses to run with ``DEBUG`` off unless
+``--allow-production`` is passed.
+"""
+
+import json
+import os
+import secrets
+import threading
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.loadtest import StubLLM, StubPrices, format_report, run_load, summarize
+from catalog.models import AnalysisPost
+
+
+class Command(BaseCommand):
+    help = "Load-test the wizard with simulated users against stub upstreams."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument(
+            "--iterations", type=int, default=2, help="Wizard runs per user."
+        )
+        parser.add_argument(
+            "--duration", type=float, help="Run for S seconds instead of iterations."
+        )
+        parser.add_argument(
+            "--think-time", type=float, default=0.0, help="Max pause between steps."
+        )
+        parser.add_argument("--llm-latency", type=float, default=0.3)
+        parser.add_argument("--price-latency", type=float, default=0.05)
+        parser.add_argument(
+            "--jitter", type=float, default=0.0, help="± seconds on stub latency."
+        )
+        parser.add_argument(
+            "--error-rate", type=float, default=0.0, help="Stub 503 probability."
+        )
+        parser.add_argument(
+            "--llm-rate", type=float, help="LLM requests/second (default: settings)."
+        )
+        parser.add_argument(
+            "--price-rate",
+            type=float,
+            help="Price requests/second (default: settings).",
+        )
+        parser.add_argument("--target", help="Base URL of a running deployment.")
+        parser.add_argument("--llm-port", type=int, default=0)
+        parser.add_argument("--price-port", type=int, default=0)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--json", help="Also write the report to this file.")
+        parser.add_argument(
+            "--password", help="Password for the temporary users (default: random)."
+        )
+        parser.add_argument(
+            "--allow-production",
+            action="store_true",
+            help="Run even with DEBUG off.",
+        )
+
+    def _users(self, n, password):
+        run = secrets.token_hex(3)
+        names = [f"loadtest-{run}-{i}" for i in range(n)]
+        for name in names:
+            User.objects.create_user(name, password=password)
+        return names
+
+    def _cleanup(self, names):
+        """Delete the temporary users; their analyses and votes cascade."""
+        posts = AnalysisPost.objects.filter(author__username__in=names).count()
+        User.objects.filter(username__in=names).delete()
+        self.stdout.write(
+            f"Removed {len(names)} temporary users and their {posts} analyses."
+        )
+
+    def _rate_limits(self, llm_rate, price_rate):
+        """``UPSTREAM_RATE_LIMITS`` with the given requests/second swapped in."""
+        limits = dict(settings.UPSTREAM_RATE_LIMITS)
+        overrides = (
+            ("llm", "--llm-rate", llm_rate),
+            ("prices", "--price-rate", price_rate),
+        )
+        for upstream, flag, rate in overrides:
+            if rate is not None:
+                if rate <= 0:
+                    raise CommandError(f"{flag} must be positive")
+                limits[upstream] = (rate, limits[upstream][1])
+        return limits
+
+    def _point_clients_at(self, llm, prices, rate_limits):
+        """Send this process's upstream calls to the stubs at *rate_limits*."""
+        from catalog.clients import llm as llm_client
+        from catalog.scheduler import get_scheduler
+
+        os.environ["OPENAI_BASE_URL"] = f"{llm.url}/v1"
+        os.environ.setdefault("OPENAI_API_KEY", "loadtest")
+        settings.PRICE_SERVICE_URL = prices.url
+        settings.UPSTREAM_RATE_LIMITS = rate_limits
+        llm_client.cache_clear()
+        get_scheduler.cache_clear()
+
+    def _serve_app(self):
+        from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+        from django.core.wsgi import get_wsgi_application
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, *args):
+                pass
+
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "127.0.0.1"]
+        server = ThreadedWSGIServer(("127.0.0.1", 0), QuietHandler)
+        server.daemon_threads = True
+        server.set_app(get_wsgi_application())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def handle(self, *args, **opts):
+        if not settings.DEBUG and not opts["allow_production"]:
+            raise CommandError(
+                "DEBUG is off: this creates temporary accounts and analyses in "
+                "the configured database. Pass --allow-production to run anyway."
+            )
+        rate_limits = self._rate_limits(opts["llm_rate"], opts["price_rate"])
+        stub_opts = {
+            "jitter": opts["jitter"],
+            "error_rate": opts["error_rate"],
+            "seed": opts["seed"],
+        }
+        llm = StubLLM(latency=opts["llm_latency"], port=opts["llm_port"], **stub_opts)
+        prices = StubPrices(
+            latency=opts["price_latency"], port=opts["price_port"], **stub_opts
+        )
+        password = opts["password"] or secrets.token_urlsafe(16)
+        usernames = self._users(opts["users"], password)
+
+        try:
+            with llm, prices:
+                server = None
+                if opts["target"]:
+                    base_url = opts["target"].rstrip("/")
+                    self.stdout.write(
+                        f"Stubs up; run the target with\n"
+                        f"  OPENAI_BASE_URL={llm.url}/v1 "
+                        f"PRICE_SERVICE_URL={prices.url} "
+                        f"LLM_RATE_LIMIT={rate_limits['llm'][0]:g} "
+                        f"PRICES_RATE_LIMIT={rate_limits['prices'][0]:g}"
+                    )
+                else:
+                    self._point_clients_at(llm, prices, rate_limits)
+                    server = self._serve_app()
+                    base_url = "http://127.0.0.1:%d" % server.server_address[1]
+
+                mode = (
+                    f"{opts['duration']:.0f}s"
+                    if opts["duration"]
+                    else f"{opts['iterations']} run(s) each"
+                )
+                self.stdout.write(f"{len(usernames)} users against {base_url}, {mode}")
+                try:
+                    samples, wall = run_load(
+                        base_url,
+                        usernames,
+                        password,
+                        iterations=opts["iterations"],
+                        duration=opts["duration"],
+                        think_time=opts["think_time"],
+                        seed=opts["seed"],
+                    )
+                finally:
+                    if server is not None:
+                        server.shutdown()
+                        server.server_close()
+        finally:
+            self._cleanup(usernames)
+
+        report = summarize(samples, wall)
+        report["stubs"] = {
+            "llm_requests": llm.requests,
+            "price_requests": prices.requests,
+        }
+        report["rate_limits"] = {
+            upstream: {"per_second": rate, "burst": burst}
+            for upstream, (rate, burst) in rate_limits.items()
+        }
+        if server is not None:
+            from catalog.clients import pool_stats
+
+            report["pools"] = pool_stats()
+        self.stdout.write(format_report(report))
+        self.stdout.write(
+            f"stub requests: {llm.requests} LLM, {prices.requests} prices"
+        )
+        self.stdout.write(
+            "rate limits: "
+            + ", ".join(
+                f"{upstream} {rate:g}/s (burst {burst})"
+                for upstream, (rate, burst) in rate_limits.items()
+            )
+            + (" (if the target was started as shown)" if opts["target"] else "")
+        )
+        if opts["json"]:
+            with open(opts["json"], "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2)
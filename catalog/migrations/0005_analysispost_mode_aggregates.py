@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-19 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0004_alter_horizonresult_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analysispost",
+            name="aggregates",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="analysispost",
+            name="mode",
+            field=models.CharField(
+                choices=[("daily", "Daily closes"), ("intraday", "Intraday bars")],
+                default="daily",
+                max_length=10,
+            ),
+        ),
+    ]
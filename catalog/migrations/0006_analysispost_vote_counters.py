@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2026-10-19 14:32
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_vote_counters(apps, schema_editor):
+    AnalysisPost = apps.get_model("catalog", "AnalysisPost")
+    Vote = apps.get_model("catalog", "Vote")
+    tallies = Vote.objects.values("post_id").annotate(
+        up=Count("pk", filter=Q(value=1)),
+        down=Count("pk", filter=Q(value=-1)),
+    )
+    for row in tallies:
+        AnalysisPost.objects.filter(pk=row["post_id"]).update(
+            upvotes=row["up"], downvotes=row["down"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0005_analysispost_mode_aggregates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analysispost",
+            name="downvotes",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="analysispost",
+            name="upvotes",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_vote_counters, migrations.RunPython.noop),
+    ]
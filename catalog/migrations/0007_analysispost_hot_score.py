@@ -0,0 +1,37 @@
+# Generated by Django 5.2.3 on 2026-10-19 14:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+from catalog.ranking import hot_score
+
+
+def backfill_hot_scores(apps, schema_editor):
+    AnalysisPost = apps.get_model("catalog", "AnalysisPost")
+    posts = AnalysisPost.objects.only("upvotes", "downvotes", "created_at")
+    for post in posts.iterator():
+        post.hot_score = hot_score(post.upvotes, post.downvotes, post.created_at)
+        post.save(update_fields=["hot_score"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0006_analysispost_vote_counters"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analysispost",
+            name="hot_score",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.RunPython(backfill_hot_scores, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="analysispost",
+            index=models.Index(
+                fields=["-hot_score", "-id"], name="catalog_post_hot_idx"
+            ),
+        ),
+    ]
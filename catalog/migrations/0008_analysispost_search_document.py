@@ -0,0 +1,53 @@
+# Generated by Django 5.2.3 on 2026-10-19 14:35
+
+from django.db import migrations, models
+
+from catalog.search import SEARCH_CONFIG, build_document
+
+# Same expression SearchVector("search_document", config=...) compiles to, so
+# catalog.search.search_posts can use the index
+SEARCH_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS catalog_post_search_idx ON catalog_analysispost "
+    "USING GIN (to_tsvector('{config}'::regconfig, "
+    "COALESCE(search_document, ''::text)))"
+).format(config=SEARCH_CONFIG)
+DROP_SEARCH_INDEX_SQL = "DROP INDEX IF EXISTS catalog_post_search_idx"
+
+
+def backfill_search_documents(apps, schema_editor):
+    AnalysisPost = apps.get_model("catalog", "AnalysisPost")
+    posts = AnalysisPost.objects.only(
+        "title", "prompt_text", "events_data", "stocks_data"
+    )
+    for post in posts.iterator():
+        post.search_document = build_document(
+            post.title, post.prompt_text, post.events_data, post.stocks_data
+        )
+        post.save(update_fields=["search_document"])
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(SEARCH_INDEX_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_SEARCH_INDEX_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0007_analysispost_hot_score"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analysispost",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,8 +1,18 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.utils import timezone
+
+from catalog import ranking, search
 
 
 class AnalysisPost(models.Model):
+    DAILY = "daily"
+    INTRADAY = "intraday"
+    MODE_CHOICES = (
+        (DAILY, "Daily closes"),
+        (INTRADAY, "Intraday bars"),
+    )
+
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="posts")
     title = models.CharField(max_length=200)
     prompt_text = models.TextField()
@@ -13,6 +23,38 @@ class AnalysisPost(models.Model):
     events_data = models.JSONField(default=list, blank=True)
     stocks_data = models.JSONField(default=list, blank=True)
     results_data = models.JSONField(default=dict, blank=True)
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES, default=DAILY)
+    # Running {ticker: {horizon: [sum, count]}} over results_data
+    aggregates = models.JSONField(default=dict, blank=True)
+
+    # Denormalised Vote tallies, maintained by catalog.votes.cast_vote
+    upvotes = models.PositiveIntegerField(default=0)
+    downvotes = models.PositiveIntegerField(default=0)
+    # catalog.ranking.hot_score of the above; refreshed on every vote
+    hot_score = models.FloatField(default=0.0)
+    # catalog.search.build_document of the fields above; rebuilt on save
+    search_document = models.TextField(blank=True, default="", editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-hot_score", "-id"], name="catalog_post_hot_idx"),
+        ]
+
+    SEARCH_FIELDS = {"title", "prompt_text", "events_data", "stocks_data"}
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.hot_score = ranking.hot_score(
+                self.upvotes, self.downvotes, self.created_at or timezone.now()
+            )
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or self.SEARCH_FIELDS & set(update_fields):
+            self.search_document = search.build_document(
+                self.title, self.prompt_text, self.events_data, self.stocks_data
+            )
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "search_document"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
@@ -0,0 +1,138 @@
+"""
+catalog/prefetch.py
+Speculative work while the user reads the wizard's confirmation pages.
+
+As soon as step 1 has dates, a background job asks for the stock
+suggestions step 2 will need and then warms the price and quote-summary
+caches for those tickers over the dates' return windows. When the user
+submits, steps 2 and 3 mostly read from the cache.
+
+Speculation is bounded so abandoned wizards cost little:
+
+* at most ``PREFETCH_MAX_PENDING`` jobs queued or running per process on
+  ``PREFETCH_WORKERS`` threads; further requests are dropped, not queued;
+* each job runs under its own ``PREFETCH_BUDGET`` upstream time budget and
+  through the shared scheduler, so it honours the upstream rate limits;
+* results live in the cache for ``PREFETCH_TTL`` seconds and then expire.
+
+Functions
+---------
+speculate(post_id, topic, dates, mode, suggestions=None) -> bool
+speculative_stocks(post_id, wait=0.0)                    -> StockResponse | None
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+
+from catalog.scheduler import UpstreamUnavailable, budget
+from catalog.schemas import StockResponse
+
+logger = logging.getLogger(__name__)
+
+# Jobs started in this process whose suggestions are not cached yet
+_pending: dict[int, threading.Event] = {}
+
+
+@lru_cache(maxsize=1)
+def _executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=settings.PREFETCH_WORKERS, thread_name_prefix="prefetch"
+    )
+
+
+@lru_cache(maxsize=1)
+def _slots() -> threading.BoundedSemaphore:
+    return threading.BoundedSemaphore(settings.PREFETCH_MAX_PENDING)
+
+
+def _stocks_key(post_id: int) -> str:
+    return f"prefetch:stocks:{post_id}"
+
+
+def _warm(tickers: list[str], dates: list[date], mode: str) -> None:
+    from catalog.prices import daily_closes, ticker_info
+    from catalog.returns import WINDOW_AFTER, WINDOW_BEFORE, event_windows
+
+    # The same per-event windows step 3 loads, not one span over the study
+    spans = [(w[0] - WINDOW_BEFORE, w[-1] + WINDOW_AFTER) for w in event_windows(dates)]
+    for tkr in tickers:
+        ticker_info(tkr)
+        if mode == "intraday":
+            from catalog.intraday import session_bars
+
+            for d in dates:
+                session_bars(tkr, d, settings.INTRADAY_INTERVAL)
+        else:
+            for start, end in spans:
+                daily_closes(tkr, start, end)
+
+
+def _run(post_id, topic, dates, mode, suggestions, ready):
+    from catalog.tickers import screen_tickers
+    from catalog.utils import generate_stocks
+
+    try:
+        with budget(settings.PREFETCH_BUDGET):
+            if suggestions is None:
+                suggestions = generate_stocks(topic, limit=5).stocks.model_dump()
+                if suggestions["positive"] or suggestions["negative"]:
+                    cache.set(_stocks_key(post_id), suggestions, settings.PREFETCH_TTL)
+            ready.set()
+            symbols = suggestions["positive"] + suggestions["negative"]
+            _warm(screen_tickers(symbols, dates).kept, dates, mode)
+    except UpstreamUnavailable:
+        pass  # out of budget or upstream down; step 2/3 fetch as usual
+    except Exception:
+        logger.exception("Speculative prefetch failed for post %s", post_id)
+    finally:
+        ready.set()
+        _pending.pop(post_id, None)
+        _slots().release()
+
+
+def speculate(
+    post_id: int,
+    topic: str,
+    dates: list[str],
+    mode: str,
+    suggestions: dict | None = None,
+) -> bool:
+    """
+    Start prefetching for a wizard run; *suggestions* are tickers already
+    known from step 1 (one-shot mode). False if disabled or saturated.
+    """
+    if not settings.PREFETCH_ENABLED or not dates:
+        return False
+    if not _slots().acquire(blocking=False):
+        return False
+    ready = _pending[post_id] = threading.Event()
+    days = [date.fromisoformat(d) for d in dates]
+    try:
+        _executor().submit(_run, post_id, topic, days, mode, suggestions, ready)
+    except RuntimeError:  # interpreter shutting down
+        _pending.pop(post_id, None)
+        _slots().release()
+        return False
+    return True
+
+
+def speculative_stocks(post_id: int, wait: float = 0.0) -> StockResponse | None:
+    """
+    Stock suggestions speculated for *post_id*, waiting up to *wait*
+    seconds for a job still running in this process. None if there are none.
+    """
+    ready = _pending.get(post_id)
+    if ready is not None and wait > 0:
+        ready.wait(wait)
+    suggestions = cache.get(_stocks_key(post_id))
+    if suggestions is None:
+        return None
+    return StockResponse(stocks=suggestions, message="")
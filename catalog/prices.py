@@ -0,0 +1,153 @@
+"""
+catalog/prices.py
+Price history and ticker metadata from Yahoo Finance, fetched through the
+shared price session and the upstream scheduler.
+
+Daily closes are cached per symbol and calendar year in Django's cache, so
+studies that revisit the same tickers — re-runs, extensions, prefetches —
+only hit the network for years they have not seen. Finished years are kept
+for ``PRICE_CACHE_TTL``; the current year for an hour, and years that came
+back empty (not listed yet, or a transient error yfinance swallowed) for ten
+minutes. Quote summaries are cached for a day.
+
+With ``PRICE_SERVICE_URL`` set, prices and quote summaries come from an HTTP
+service instead of Yahoo (the load-test stub in catalog/loadtest.py)::
+
+    GET {url}/closes/{symbol}?start=YYYY-MM-DD&end=YYYY-MM-DD
+        -> {"dates": ["YYYY-MM-DD", ...], "closes": [float, ...]}
+    GET {url}/info/{symbol} -> {"longName": ..., ...}
+
+Its data is cached under keys tagged with a hash of the URL, so stub prices
+never mix with Yahoo's in a shared cache.
+
+Functions
+---------
+daily_closes(symbol: str, start, end) -> pandas.Series
+ticker_info(symbol: str)              -> dict
+store_closes(symbol: str, closes, timeout=None)
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+
+from catalog.clients import price_session, ticker
+from catalog.scheduler import get_scheduler
+
+_CURRENT_YEAR_TTL = 60 * 60
+_EMPTY_YEAR_TTL = 10 * 60
+_INFO_TTL = 24 * 60 * 60
+
+
+def _prefix(kind: str) -> str:
+    """Cache key prefix for the active price source."""
+    url = settings.PRICE_SERVICE_URL
+    if not url:
+        return f"prices:{kind}"
+    return f"prices:{kind}@{hashlib.sha1(url.encode()).hexdigest()[:12]}"
+
+
+def _year_key(symbol: str, year: int) -> str:
+    return f"{_prefix('daily')}:{symbol}:{year}"
+
+
+def _service_json(path: str, **params):
+    url = settings.PRICE_SERVICE_URL.rstrip("/") + path
+
+    def get():
+        resp = price_session().get(url, params=params)
+        resp.raise_for_status()
+        return resp.json()
+
+    return get_scheduler().call("prices", get)
+
+
+def _fetch_closes(symbol: str, start: date, end: date):
+    import pandas as pd
+
+    if settings.PRICE_SERVICE_URL:
+        data = _service_json(
+            f"/closes/{symbol}", start=start.isoformat(), end=end.isoformat()
+        )
+        return pd.Series(
+            data["closes"],
+            index=pd.to_datetime(data["dates"]),
+            dtype="float64",
+            name=symbol,
+        )
+    hist = get_scheduler().call(
+        "prices", ticker(symbol).history, start=start, end=end, auto_adjust=True
+    )
+    if "Close" not in hist:
+        return pd.Series(dtype="float64", name=symbol)
+    return hist["Close"].tz_localize(None).rename(symbol)
+
+
+def _as_date(value) -> date:
+    return value.date() if hasattr(value, "date") else value
+
+
+def daily_closes(symbol: str, start, end):
+    """Adjusted daily closes in ``[start, end)``, tz-naive; empty if none."""
+    import pandas as pd
+
+    start, end = _as_date(start), _as_date(end)
+    years = range(start.year, end.year + 1)
+    keys = {year: _year_key(symbol, year) for year in years}
+    cached = cache.get_many(keys.values())
+    missing = [year for year in years if keys[year] not in cached]
+
+    if missing:
+        # One request spanning every missing year, split back per year
+        fetched = _fetch_closes(
+            symbol, date(missing[0], 1, 1), date(missing[-1] + 1, 1, 1)
+        )
+        this_year = date.today().year
+        for year in missing:
+            part = fetched[fetched.index.year == year]
+            cached[keys[year]] = part
+            if part.empty:
+                ttl = _EMPTY_YEAR_TTL
+            elif year < this_year:
+                ttl = settings.PRICE_CACHE_TTL
+            else:
+                ttl = _CURRENT_YEAR_TTL
+            cache.set(keys[year], part, ttl)
+
+    series = pd.concat([cached[keys[year]] for year in years]).rename(symbol)
+    return series[
+        (series.index >= pd.Timestamp(start)) & (series.index < pd.Timestamp(end))
+    ]
+
+
+def store_closes(symbol: str, closes, timeout: int | None = None) -> None:
+    """
+    Seed the per-year cache with *closes* (a tz-naive daily Series), e.g.
+    for benchmarks and offline runs; *timeout* None keeps it until evicted.
+    """
+    closes = closes.rename(symbol)
+    cache.set_many(
+        {
+            _year_key(symbol, year): closes[closes.index.year == year]
+            for year in closes.index.year.unique()
+        },
+        timeout,
+    )
+
+
+def ticker_info(symbol: str) -> dict:
+    """Yahoo's quote summary for *symbol* (name, business summary …)."""
+    key = f"{_prefix('info')}:{symbol}"
+    info = cache.get(key)
+    if info is None:
+        if settings.PRICE_SERVICE_URL:
+            info = _service_json(f"/info/{symbol}") or {}
+        else:
+            tk = ticker(symbol)
+            info = get_scheduler().call("prices", lambda: tk.info) or {}
+        cache.set(key, info, _INFO_TTL)
+    return info
@@ -0,0 +1,29 @@
+"""
+catalog/ranking.py
+"Hot" ranking for analyses: net votes on a log scale plus a recency term.
+
+The score only depends on the vote tallies and ``created_at``, so it is
+recomputed whenever those change (post creation, every vote) and stored in
+an indexed column. Newer posts outrank older ones without any periodic
+refresh: 45 000 s (12.5 h) of age is worth a factor of ten in net votes.
+
+Functions
+---------
+hot_score(upvotes: int, downvotes: int, created_at: datetime) -> float
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+
+_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+_DECAY_SECONDS = 45000
+
+
+def hot_score(upvotes: int, downvotes: int, created_at: datetime) -> float:
+    net = upvotes - downvotes
+    order = math.log10(max(abs(net), 1))
+    sign = (net > 0) - (net < 0)
+    age = (created_at - _EPOCH).total_seconds()
+    return round(sign * order + age / _DECAY_SECONDS, 7)
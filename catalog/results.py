@@ -0,0 +1,66 @@
+"""
+catalog/results.py
+Helpers for reading the ``results_data`` blob stored on AnalysisPost and the
+running aggregates kept next to it.
+
+Aggregates hold ``{ticker: {horizon: [sum, count]}}`` so that adding cells
+to a study updates the means without re-reading every stored result.
+
+Functions
+---------
+aggregate(results: dict)                  -> dict
+merge_cells(aggregates: dict, cells: dict) -> dict
+matrix_from_aggregates(aggregates: dict)  -> dict
+mean_matrix(results: dict)                -> dict
+"""
+
+from __future__ import annotations
+
+# Display order of the return horizons computed by the wizard (intraday
+# studies use the first four, daily studies the rest)
+HORIZONS = ["5m", "30m", "1h", "EOD", "1D", "1W", "2W", "1M", "2M"]
+
+
+def merge_cells(aggregates: dict, cells: dict) -> dict:
+    """Fold ``{date: {ticker: {horizon: value}}}`` into *aggregates* in place."""
+    for tmap in cells.values():
+        for tkr, hmap in tmap.items():
+            per_ticker = aggregates.setdefault(tkr, {})
+            for h, value in hmap.items():
+                acc = per_ticker.setdefault(h, [0.0, 0])
+                if value is not None:
+                    acc[0] += value
+                    acc[1] += 1
+    return aggregates
+
+
+def aggregate(results: dict) -> dict:
+    """Sum/count per ticker × horizon for a whole ``results_data`` blob."""
+    return merge_cells({}, results)
+
+
+def matrix_from_aggregates(aggregates: dict) -> dict:
+    """
+    Mean return per ticker × horizon as a compact, JSON-ready payload::
+
+        {"tickers": [...], "horizons": [...], "z": [[mean, ...], ...]}
+
+    ``z`` has one row per ticker and one column per horizon; cells without
+    any observation are ``None``.
+    """
+    horizon_set = {h for hmap in aggregates.values() for h in hmap}
+    horizons = [h for h in HORIZONS if h in horizon_set]
+    tickers = sorted(aggregates)
+    z = []
+    for tkr in tickers:
+        row = []
+        for h in horizons:
+            total, count = aggregates[tkr].get(h, (0.0, 0))
+            row.append(total / count if count else None)
+        z.append(row)
+    return {"tickers": tickers, "horizons": horizons, "z": z}
+
+
+def mean_matrix(results: dict) -> dict:
+    """Collapse ``{date: {ticker: {horizon: value}}}`` into the mean matrix."""
+    return matrix_from_aggregates(aggregate(results))
@@ -0,0 +1,201 @@
+"""
+catalog/returns.py
+Cumulative returns after each event date, from daily closes.
+
+Results use the ``results_data`` layout stored on AnalysisPost::
+
+    {"YYYY-MM-DD": {"TICKER": {"1D": 0.012, "1W": None, ...}}}
+
+Prices are only loaded around the events. Sorted dates are grouped into
+windows (10 days before the first event to ``WINDOW_AFTER`` after the last)
+that merge when they overlap, and each window is processed in ticker chunks
+sized so the price block stays under ``RETURNS_MEMORY_LIMIT_MB``. A study
+spanning decades therefore holds one small block at a time instead of every
+bar between its first and last event. Blocks are computed in-process or
+across a process pool (``RETURNS_BACKEND``, see catalog/compute.py) as they
+are loaded.
+
+Functions
+---------
+event_windows(dates, max_days)                    -> list[list[date]]
+daily_event_returns(dates, tickers, memory_limit=None, stats=None,
+                    backend=None, workers=None,
+                    trace_memory=False)           -> dict
+returns_from_prices(prices, dates, tickers, backend="serial", workers=1) -> dict
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import numpy as np
+from django.conf import settings
+
+from catalog.compute import compute_block, compute_blocks
+from catalog.prices import daily_closes
+
+# Trading days after the event for each horizon label
+DAILY_HORIZONS = {"1D": 1, "1W": 5, "2W": 10, "1M": 20, "2M": 40}
+
+# Calendar days loaded around each event: enough for a base close before a
+# long weekend and for 40 trading days after, holidays included
+WINDOW_BEFORE = timedelta(days=10)
+WINDOW_AFTER = timedelta(days=70)
+
+# Price blocks are float64; allow for the copies pandas and numpy make
+_BYTES_PER_CELL = 8 * 4
+
+
+def event_windows(dates: list[date], max_days: int | None = None) -> list[list[date]]:
+    """
+    Group sorted, distinct *dates* into runs whose price windows overlap,
+    starting a new run when a window would span more than *max_days*.
+    """
+    span = WINDOW_BEFORE + WINDOW_AFTER
+    groups: list[list[date]] = []
+    for d in sorted(set(dates)):
+        if groups:
+            first, last = groups[-1][0], groups[-1][-1]
+            overlaps = d - WINDOW_BEFORE <= last + WINDOW_AFTER
+            fits = max_days is None or (d - first + span).days <= max_days
+            if overlaps and fits:
+                groups[-1].append(d)
+                continue
+        groups.append([d])
+    return groups
+
+
+def _chunk_plan(n_tickers: int, limit_bytes: int) -> tuple[int, int]:
+    """(max calendar days per window, tickers per chunk) for a memory limit."""
+    span = (WINDOW_BEFORE + WINDOW_AFTER).days
+    per_ticker_day = _BYTES_PER_CELL * 5 / 7  # trading days only
+    tickers = max(1, min(n_tickers, int(limit_bytes / (per_ticker_day * span))))
+    days = max(span, int(limit_bytes / (per_ticker_day * tickers)))
+    return days, tickers
+
+
+@contextmanager
+def _peak_memory(stats: dict | None, trace: bool):
+    """Record the traced peak allocation into *stats* when *trace* is set."""
+    if stats is None or not trace:
+        yield
+        return
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    try:
+        yield
+    finally:
+        stats["peak_bytes"] = tracemalloc.get_traced_memory()[1] - base
+        if started:
+            tracemalloc.stop()
+
+
+def daily_event_returns(
+    dates: list[date],
+    tickers: list[str],
+    memory_limit: int | None = None,
+    stats: dict | None = None,
+    backend: str | None = None,
+    workers: int | None = None,
+    trace_memory: bool = False,
+) -> dict:
+    """
+    Fetch closes around *dates* and compute every date × ticker cell,
+    keeping each price block under *memory_limit* bytes (default
+    ``RETURNS_MEMORY_LIMIT_MB``), on the ``RETURNS_BACKEND`` with
+    ``RETURNS_WORKERS`` processes unless *backend*/*workers* are given.
+    Pass a dict as *stats* to get back the number of windows and chunks and
+    the seconds spent loading prices and computing returns (pooled work that
+    runs while prices load counts as loading); *trace_memory*
+    adds the peak traced allocation (this process only, and slow).
+    """
+    import pandas as pd
+
+    if not dates or not tickers:
+        return {}
+    if memory_limit is None:
+        memory_limit = settings.RETURNS_MEMORY_LIMIT_MB * 2**20
+    backend = backend or settings.RETURNS_BACKEND
+    workers = workers or settings.RETURNS_WORKERS
+    symbols = list(dict.fromkeys(tickers))
+    max_days, per_chunk = _chunk_plan(len(symbols), memory_limit)
+    windows = event_windows(dates, max_days)
+    chunks = [symbols[i : i + per_chunk] for i in range(0, len(symbols), per_chunk)]
+
+    load = 0.0
+
+    def blocks():
+        nonlocal load
+        for window in windows:
+            start, end = window[0] - WINDOW_BEFORE, window[-1] + WINDOW_AFTER
+            for chunk in chunks:
+                t0 = time.perf_counter()
+                prices = pd.DataFrame(
+                    {t: daily_closes(t, start, end) for t in chunk}
+                ).sort_index()
+                block = _price_block(prices, window, chunk)
+                load += time.perf_counter() - t0
+                if block is not None:
+                    yield block
+
+    results: dict = {}
+    started = time.perf_counter()
+    with _peak_memory(stats, trace_memory):
+        for cells in compute_blocks(blocks(), backend, workers):
+            for iso, tmap in cells.items():
+                results.setdefault(iso, {}).update(tmap)
+    compute = time.perf_counter() - started - load
+    if stats is not None:
+        stats.update(
+            windows=len(windows),
+            chunks=len(windows) * len(chunks),
+            load_seconds=load,
+            compute_seconds=compute,
+        )
+    # Same date order as the single-window computation
+    return {
+        d.isoformat(): results[d.isoformat()] for d in dates if d.isoformat() in results
+    }
+
+
+def returns_from_prices(
+    prices,
+    dates: list[date],
+    tickers: list[str],
+    backend: str = "serial",
+    workers: int = 1,
+) -> dict:
+    """
+    Cumulative return from the last close on/before each date to the close
+    ``DAILY_HORIZONS[label]`` trading days later. Cells without a base price
+    are left out; horizons past the end of *prices* are ``None``. *backend*
+    and *workers* pick a catalog.compute backend.
+    """
+    block = _price_block(prices, dates, tickers)
+    if block is None:
+        return {}
+    return compute_block(*block, backend, workers)
+
+
+def _price_block(prices, dates: list[date], tickers: list[str]) -> tuple | None:
+    """catalog.compute block arguments for *prices*; None if nothing to do."""
+    import pandas as pd
+
+    tickers = [t for t in tickers if t in prices]
+    if prices.empty or not tickers:
+        return None
+    idx = prices.index.get_indexer(pd.to_datetime(dates), method="ffill")
+    return (
+        prices[tickers].to_numpy(dtype="float64"),
+        idx,
+        [d.isoformat() for d in dates],
+        tickers,
+        np.array(list(DAILY_HORIZONS.values())),
+        list(DAILY_HORIZONS),
+    )
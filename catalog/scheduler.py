@@ -0,0 +1,257 @@
+"""
+catalog/scheduler.py
+Rate-limited, retrying calls to upstream services (LLM and price data).
+
+Every upstream gets a token bucket; failed calls that look transient
+(HTTP 408/429/5xx, connection errors, timeouts) are retried with jittered
+exponential backoff, honouring ``Retry-After`` when the upstream sends one.
+A :func:`budget` caps the wall time a whole analysis may spend waiting.
+
+The scheduler only inspects exception attributes, so it works with the
+OpenAI SDK, yfinance/curl_cffi and plain ``urllib`` alike.
+
+Functions
+---------
+get_scheduler() -> Scheduler
+budget(seconds: float) -> ContextManager[Budget]
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Callable, TypeVar
+
+from django.conf import settings
+
+T = TypeVar("T")
+
+_RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+# Transient errors from the SDKs, matched by class name to avoid importing them
+_RETRYABLE_NAMES = {"APIConnectionError", "APITimeoutError", "YFRateLimitError"}
+
+
+class UpstreamUnavailable(Exception):
+    """An upstream kept failing after every retry."""
+
+
+class BudgetExceeded(UpstreamUnavailable):
+    """The analysis ran out of wall time before the upstream answered."""
+
+
+# ---------- time budget ------------------------------------------------------
+
+
+class Budget:
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.started = clock()
+        self.deadline = self.started + seconds
+
+    def remaining(self) -> float:
+        return self.deadline - self._clock()
+
+    def elapsed(self) -> float:
+        return self._clock() - self.started
+
+
+_budget: ContextVar[Budget | None] = ContextVar("upstream_budget", default=None)
+
+
+@contextmanager
+def budget(seconds: float, clock: Callable[[], float] = time.monotonic):
+    """
+    Cap the time scheduled calls inside the block may take. Nested budgets
+    never extend an outer one.
+    """
+    new = Budget(max(seconds, 0.0), clock)
+    outer = _budget.get()
+    if outer is not None and outer.deadline < new.deadline:
+        new.deadline = outer.deadline
+    token = _budget.set(new)
+    try:
+        yield new
+    finally:
+        _budget.reset(token)
+
+
+# ---------- error classification ---------------------------------------------
+
+
+def _status(exc: BaseException) -> int | None:
+    """HTTP status carried by *exc* (SDK errors, urllib's HTTPError)."""
+    response = getattr(exc, "response", None)
+    for value in (
+        getattr(response, "status_code", None),
+        getattr(exc, "status_code", None),
+        # urllib's HTTPError; curl errors also have .code but no headers
+        getattr(exc, "code", None) if hasattr(exc, "headers") else None,
+    ):
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _headers(exc: BaseException):
+    headers = getattr(exc, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+    return headers
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if _status(exc) in _RETRYABLE_STATUS:
+        return True
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    names = {cls.__name__ for cls in type(exc).__mro__}
+    if names & _RETRYABLE_NAMES:
+        return True
+    # curl_cffi network errors (ConnectionError/Timeout) subclass OSError
+    return "RequestException" in names and _status(exc) is None
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Seconds the upstream asked us to wait, if it said so."""
+    headers = _headers(exc)
+    if headers is None:
+        return None
+    ms = headers.get("retry-after-ms")
+    if ms:
+        try:
+            return float(ms) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+# ---------- rate limiting ----------------------------------------------------
+
+
+class TokenBucket:
+    """Classic token bucket: *rate* tokens per second, up to *capacity*."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _wait_time(self) -> float:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def acquire(self, deadline: float | None = None) -> None:
+        while True:
+            with self._lock:
+                wait = self._wait_time()
+            if not wait:
+                return
+            if deadline is not None and self._clock() + wait > deadline:
+                raise BudgetExceeded("rate limit wait exceeds the time budget")
+            self._sleep(wait)
+
+
+# ---------- scheduler --------------------------------------------------------
+
+
+class Scheduler:
+    def __init__(
+        self,
+        limits: dict[str, tuple[float, float]],
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets = {
+            name: TokenBucket(rate, burst, clock, sleep)
+            for name, (rate, burst) in limits.items()
+        }
+
+    def backoff(self, attempt: int, exc: BaseException) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+        hinted = retry_after(exc)
+        return max(delay, hinted) if hinted is not None else delay
+
+    def call(self, upstream: str, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run ``fn(*args, **kwargs)`` under *upstream*'s rate limit, retrying
+        transient failures. Raises :class:`UpstreamUnavailable` once retries
+        are exhausted and :class:`BudgetExceeded` when the current
+        :func:`budget` runs out; other errors propagate unchanged.
+        """
+        current = _budget.get()
+        deadline = current.deadline if current is not None else None
+        bucket = self._buckets.get(upstream)
+
+        for attempt in range(self.max_retries + 1):
+            if deadline is not None and self._clock() >= deadline:
+                raise BudgetExceeded(f"{upstream}: time budget exhausted")
+            if bucket is not None:
+                bucket.acquire(deadline)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as exc:
+                if not is_retryable(exc):
+                    raise
+                if attempt == self.max_retries:
+                    raise UpstreamUnavailable(
+                        f"{upstream}: gave up after {attempt + 1} attempts"
+                    ) from exc
+                delay = self.backoff(attempt, exc)
+                if deadline is not None and self._clock() + delay > deadline:
+                    raise BudgetExceeded(
+                        f"{upstream}: retry would exceed the time budget"
+                    ) from exc
+                self._sleep(delay)
+        raise AssertionError("unreachable")
+
+
+@lru_cache(maxsize=1)
+def get_scheduler() -> Scheduler:
+    """The process-wide scheduler configured from settings."""
+    return Scheduler(
+        settings.UPSTREAM_RATE_LIMITS,
+        max_retries=settings.UPSTREAM_MAX_RETRIES,
+        backoff_base=settings.UPSTREAM_BACKOFF_BASE,
+        backoff_max=settings.UPSTREAM_BACKOFF_MAX,
+    )
@@ -33,6 +33,20 @@ class StockResponse(BaseModel):
     message: str
 
 
+class EventSummary(BaseModel):
+    date: date
+    description: str = ""
+
+
+class OneShotResponse(BaseModel):
+    """Dates, per-date descriptions and tickers from a single LLM call."""
+
+    confirmed: bool
+    events: List[EventSummary]
+    stocks: StocksBasket
+    message: str = ""
+
+
 class AnalysisParams(BaseModel):
     title: str
     events: List[date]
@@ -0,0 +1,71 @@
+"""
+catalog/search.py
+Full-text and ticker search over saved analyses.
+
+Every AnalysisPost carries a denormalised ``search_document``: title, prompt,
+event descriptions and chosen tickers in one text column, rebuilt by
+``AnalysisPost.save``. On Postgres it is matched with ``websearch_to_tsquery``
+against a GIN expression index (migration 0008) and ranked with
+``ts_rank``; other backends (SQLite in local runs and tests) fall back to
+one ``icontains`` per query term, ranked by hot score.
+
+Functions
+---------
+build_document(title, prompt_text, events, stocks) -> str
+search_posts(query: str, queryset=None)             -> QuerySet
+"""
+
+from __future__ import annotations
+
+from django.db import connection
+
+# Postgres text-search configuration; must match the index in migration 0008
+SEARCH_CONFIG = "english"
+
+
+def build_document(title: str, prompt_text: str, events: list, stocks: list) -> str:
+    """The text indexed for one analysis, one field per line."""
+    parts = [title or "", prompt_text or ""]
+    parts += [ev.get("description") or "" for ev in events or []]
+    tickers = [s.get("ticker", "") for s in stocks or []]
+    names = [s.get("name") or "" for s in stocks or []]
+    parts += [" ".join(filter(None, tickers)), " ".join(filter(None, names))]
+    return "\n".join(p.strip() for p in parts if p and p.strip())
+
+
+def _terms(query: str) -> list[str]:
+    return [t.strip("\"'") for t in query.split() if t.strip("\"'")]
+
+
+def search_posts(query: str, queryset=None):
+    """
+    Analyses matching *query*, best first. An empty query matches nothing.
+    Tickers are ordinary words in the document, so "AAPL" and "apple iphone
+    launch" go through the same path.
+    """
+    from catalog.models import AnalysisPost
+
+    posts = AnalysisPost.objects.all() if queryset is None else queryset
+    query = (query or "").strip()
+    if not query:
+        return posts.none()
+
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVector,
+        )
+
+        vector = SearchVector("search_document", config=SEARCH_CONFIG)
+        ts_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+        return (
+            posts.annotate(document=vector)
+            .filter(document=ts_query)
+            .annotate(rank=SearchRank(vector, ts_query))
+            .order_by("-rank", "-hot_score", "-id")
+        )
+
+    for term in _terms(query):
+        posts = posts.filter(search_document__icontains=term)
+    return posts.order_by("-hot_score", "-id")
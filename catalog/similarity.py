@@ -0,0 +1,202 @@
+"""
+catalog/similarity.py
+Local near-duplicate detection for wizard topics, so a topic that has
+already been studied reuses its event dates instead of another
+``generate_dates`` round trip.
+
+Every ``prompt_text`` is vectorised as hashed word unigrams plus character
+trigrams of each word ("2008 financial crisis" and "global financial crisis
+2008" share most of both), weighted by TF-IDF and compared by cosine
+similarity. Vectors live in one sparse in-memory index per process; posts
+are appended as they are saved (``post_save``) and any written by other
+processes are picked up by primary key before each lookup.
+
+Numbers are treated as exact. Digit tokens get no trigrams ("2019" and
+"2020" share most of theirs, but a year is not a spelling variant), and a
+post is only reused when its prompt has the same set of numbers as the
+query, since years decide which dates a topic needs.
+
+Functions
+---------
+topic_features(text: str)                    -> dict[int, float]
+topic_numbers(text: str)                     -> frozenset[str]
+get_topic_index()                            -> TopicIndex
+reusable_topic(query: str, threshold=None)   -> (AnalysisPost, float) | None
+index_saved_post(sender, instance, created, **kwargs)
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import zlib
+from functools import lru_cache
+
+import numpy as np
+from django.conf import settings
+
+# Hashed feature space: a prompt has a few dozen features, so collisions only
+# blur scores slightly
+DIMENSIONS = 2**10
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at by for from in into is of on or since the to with".split()
+)
+
+
+def _bucket(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8")) % DIMENSIONS
+
+
+def topic_numbers(text: str) -> frozenset[str]:
+    """The numbers in *text* (years, split ratios …) as strings."""
+    return frozenset(re.findall(r"\d+", text))
+
+
+def topic_features(text: str) -> dict[int, float]:
+    """Sublinear term frequencies of hashed words and word trigrams."""
+    counts: dict[int, int] = {}
+    for word in _WORD_RE.findall(text.lower()):
+        if word in _STOPWORDS:
+            continue
+        grams = [f"w:{word}"]
+        if not word.isdigit():
+            padded = f" {word} "
+            grams += [padded[i : i + 3] for i in range(len(padded) - 2)]
+        for gram in grams:
+            b = _bucket(gram)
+            counts[b] = counts.get(b, 0) + 1
+    return {b: 1.0 + np.log(n) for b, n in counts.items()}
+
+
+class TopicIndex:
+    """
+    Append-only TF-IDF index over post prompts, keyed by post pk. Rows are
+    stored sparsely (CSR-style bucket and weight arrays that double when
+    full), so a post costs a few hundred bytes and adding one is amortised
+    O(its features).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = np.zeros(0, dtype="int16")
+        self._weights = np.zeros(0, dtype="float32")
+        self._nnz = 0
+        self._starts = np.zeros(0, dtype="int64")  # first entry of each row
+        self._pks = np.zeros(0, dtype="int64")
+        self._size = 0
+        self._seen: set[int] = set()
+        self._df = np.zeros(DIMENSIONS, dtype="float64")
+        self.last_pk = 0
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    @staticmethod
+    def _reserve(array: np.ndarray, used: int, needed: int) -> np.ndarray:
+        if used + needed <= len(array):
+            return array
+        grown = np.zeros(max(2 * len(array), used + needed, 64), dtype=array.dtype)
+        grown[:used] = array[:used]
+        return grown
+
+    def add(self, pk: int, text: str) -> None:
+        features = topic_features(text)
+        with self._lock:
+            if pk in self._seen:
+                return
+            self._seen.add(pk)
+            self.last_pk = max(self.last_pk, pk)
+            if not features:  # nothing to match on
+                return
+            k, lo = len(features), self._nnz
+            self._buckets = self._reserve(self._buckets, lo, k)
+            self._weights = self._reserve(self._weights, lo, k)
+            self._starts = self._reserve(self._starts, self._size, 1)
+            self._pks = self._reserve(self._pks, self._size, 1)
+            buckets = np.fromiter(features, dtype="int16", count=k)
+            self._buckets[lo : lo + k] = buckets
+            self._weights[lo : lo + k] = np.fromiter(
+                features.values(), dtype="float32", count=k
+            )
+            self._df[buckets] += 1
+            self._starts[self._size] = lo
+            self._pks[self._size] = pk
+            self._nnz += k
+            self._size += 1
+
+    def catch_up(self) -> int:
+        """Index posts saved by other processes since ``last_pk``."""
+        from catalog.models import AnalysisPost
+
+        rows = (
+            AnalysisPost.objects.filter(pk__gt=self.last_pk)
+            .order_by("pk")
+            .values_list("pk", "prompt_text")
+        )
+        added = 0
+        for pk, text in rows.iterator(chunk_size=500):
+            self.add(pk, text)
+            added += 1
+        return added
+
+    def nearest(self, text: str, k: int = 5) -> list[tuple[int, float]]:
+        """Up to *k* ``(pk, cosine)`` pairs, most similar first."""
+        features = topic_features(text)
+        if not features:
+            return []
+        with self._lock:
+            n, nnz = self._size, self._nnz
+            buckets, weights = self._buckets[:nnz], self._weights[:nnz]
+            starts, pks = self._starts[:n].copy(), self._pks[:n].copy()
+            idf = (np.log((1 + len(self._seen)) / (1 + self._df)) + 1).astype("float32")
+        if not n:
+            return []
+        query = np.zeros(DIMENSIONS, dtype="float32")
+        query[list(features)] = list(features.values())
+        query *= idf
+        # cos(tf·idf, query) per row, summing each row's entries in place
+        dots = np.add.reduceat(weights * (query * idf)[buckets], starts)
+        sq = np.add.reduceat(weights * weights * (idf * idf)[buckets], starts)
+        norms = np.sqrt(sq) * np.linalg.norm(query)
+        scores = dots / np.where(norms > 0, norms, 1)
+        top = np.argsort(-scores)[:k]
+        return [(int(pks[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+
+@lru_cache(maxsize=1)
+def get_topic_index() -> TopicIndex:
+    """The process-wide index, built from the database on first use."""
+    index = TopicIndex()
+    index.catch_up()
+    return index
+
+
+def reusable_topic(query: str, threshold: float | None = None):
+    """
+    The closest earlier post with stored events when its prompt scores at
+    least *threshold* (default ``TOPIC_REUSE_THRESHOLD``) and mentions the
+    same numbers as *query*, with its score; otherwise None.
+    """
+    from catalog.models import AnalysisPost
+
+    threshold = settings.TOPIC_REUSE_THRESHOLD if threshold is None else threshold
+    index = get_topic_index()
+    index.catch_up()
+    candidates = [(pk, s) for pk, s in index.nearest(query) if s >= threshold]
+    if not candidates:
+        return None
+    posts = AnalysisPost.objects.exclude(events_data=[]).in_bulk(
+        [pk for pk, _ in candidates]
+    )
+    numbers = topic_numbers(query)
+    for pk, score in candidates:
+        if pk in posts and topic_numbers(posts[pk].prompt_text) == numbers:
+            return posts[pk], score
+    return None
+
+
+def index_saved_post(sender, instance, created, **kwargs):
+    """``post_save`` receiver: add new posts to an already-built index."""
+    if created and get_topic_index.cache_info().currsize:
+        get_topic_index().add(instance.pk, instance.prompt_text)
@@ -0,0 +1,34 @@
+// Render the mean-return heatmap from catalog:analysis_data.
+// The payload is {"tickers": [...], "horizons": [...], "z": [[...], ...]}.
+(function () {
+  var el = document.getElementById("heatmap");
+  if (!el || !window.Plotly) {
+    return;
+  }
+
+  // ColorBrewer RdYlGn (plotly.js has no named equivalent)
+  var RD_YL_GN = [
+    [0.0, "#a50026"], [0.1, "#d73027"], [0.2, "#f46d43"], [0.3, "#fdae61"],
+    [0.4, "#fee08b"], [0.5, "#ffffbf"], [0.6, "#d9ef8b"], [0.7, "#a6d96a"],
+    [0.8, "#66bd63"], [0.9, "#1a9850"], [1.0, "#006837"]
+  ];
+
+  fetch(el.dataset.src, { credentials: "same-origin" })
+    .then(function (resp) { return resp.json(); })
+    .then(function (data) {
+      Plotly.newPlot(el, [{
+        type: "heatmap",
+        x: data.horizons,
+        y: data.tickers,
+        z: data.z,
+        colorscale: RD_YL_GN,
+        colorbar: { title: { text: "Mean Return" } },
+        hovertemplate: "Horizon: %{x}<br>Ticker: %{y}<br>Mean Return: %{z:.4f}<extra></extra>"
+      }], {
+        title: { text: "Mean Cumulative Return Heatmap" },
+        xaxis: { title: { text: "Horizon" }, side: "bottom" },
+        yaxis: { title: { text: "Ticker" }, autorange: "reversed" },
+        height: 600
+      }, { responsive: true });
+    });
+})();
@@ -0,0 +1,66 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from catalog import clients
+
+COMPLETION = {
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "ok"},
+        }
+    ],
+}
+
+
+class _FakeOpenAI(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps(COMPLETION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    clients.llm.cache_clear()
+    clients._llm_transport.cache_clear()
+    yield
+    clients.llm.cache_clear()
+    clients._llm_transport.cache_clear()
+    server.shutdown()
+
+
+def test_llm_client_reuses_pooled_connection(fake_llm):
+    before = clients.METRICS["llm"].snapshot()
+    for _ in range(3):
+        clients.llm().chat.completions.create(
+            model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}]
+        )
+    after = clients.pool_stats()["llm"]
+
+    assert after["requests"] - before["requests"] == 3
+    assert after["new_connections"] - before["new_connections"] == 1
+    assert after["reused_connections"] - before["reused_connections"] == 2
+    assert after["open"] == 1 and after["idle"] == 1
+    assert after["in_flight"] == 0
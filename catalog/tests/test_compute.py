@@ -0,0 +1,151 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+from catalog import compute
+
+LABELS = ["1D", "1W", "2W", "1M", "2M"]
+STEPS = np.array([1, 5, 10, 20, 40])
+
+
+@pytest.fixture
+def block():
+    rng = np.random.default_rng(3)
+    values = 100 + rng.standard_normal((300, 7)).cumsum(axis=0)
+    values[:50, 2] = np.nan
+    idx = np.array([-1, 10, 40, 120, 280, 299, 10])
+    isos = [f"2020-01-{d:02d}" for d in range(1, 7)] + ["2020-01-02"]
+    return values, idx, isos, [f"T{i}" for i in range(7)]
+
+
+@pytest.fixture
+def pool_backend(monkeypatch):
+    monkeypatch.setattr(compute, "MIN_PARALLEL_CELLS", 0)
+    yield
+    compute.get_pool(3).shutdown()
+    compute.get_pool.cache_clear()
+
+
+def test_process_backend_matches_serial(block, pool_backend):
+    values, idx, isos, tickers = block
+    serial = compute.compute_block(values, idx, isos, tickers, STEPS, LABELS)
+    pooled = compute.compute_block(
+        values, idx, isos, tickers, STEPS, LABELS, "process", workers=3
+    )
+    assert pooled == serial
+    assert list(pooled) == list(serial)
+    assert "T2" not in serial["2020-01-03"]  # no base close yet
+    assert serial["2020-01-06"]["T0"]["1D"] is None  # past the last bar
+    assert not _scratch_files()
+
+
+def test_unknown_backend_is_rejected(block):
+    with pytest.raises(ValueError):
+        compute.compute_block(*block, STEPS, LABELS, backend="gpu")
+
+
+def _sparse_blocks(n, tickers=40):
+    """One- or two-date blocks, as for events more than a window apart."""
+    rng = np.random.default_rng(5)
+    for i in range(n):
+        dates = 1 + i % 2
+        values = 100 + rng.standard_normal((55, tickers)).cumsum(axis=0)
+        isos = [f"{2000 + i // 12}-{1 + i % 12:02d}-{d + 1:02d}" for d in range(dates)]
+        names = [f"T{j}" for j in range(tickers)]
+        yield values, np.arange(5, 5 + dates), isos, names, STEPS, LABELS
+
+
+def _merged(results):
+    merged = {}
+    for cells in results:
+        for iso, tmap in cells.items():
+            merged.setdefault(iso, {}).update(tmap)
+    return merged
+
+
+def test_small_blocks_are_spread_across_the_pool(monkeypatch):
+    monkeypatch.setattr(compute, "MIN_PARALLEL_CELLS", 200)
+    monkeypatch.setattr(compute, "TASK_CELLS", 100)
+    submitted = []
+    try:
+        pool = compute.get_pool(2)
+        real_submit = pool.submit
+        monkeypatch.setattr(
+            pool,
+            "submit",
+            lambda fn, path, parts: submitted.append(parts)
+            or real_submit(fn, path, parts),
+        )
+        serial = _merged(compute.compute_blocks(_sparse_blocks(30)))
+        pooled = _merged(compute.compute_blocks(_sparse_blocks(30), "process", 2))
+    finally:
+        compute.get_pool(2).shutdown()
+        compute.get_pool.cache_clear()
+    assert pooled == serial
+    assert len(serial) == 45
+    assert len(submitted) > 5 and sum(map(len, submitted)) == 30
+    # Prices travel through the scratch file, not the pickled task
+    sent = [arg for parts in submitted for part in parts for arg in part]
+    assert max(np.ndim(arg) for arg in sent) == 1
+    assert not _scratch_files()
+
+
+def _scratch_files():
+    return [f for f in os.listdir(compute._scratch_dir()) if f.startswith("returns-")]
+
+
+def test_stopping_early_removes_scratch_files(monkeypatch):
+    monkeypatch.setattr(compute, "MIN_PARALLEL_CELLS", 200)
+    monkeypatch.setattr(compute, "TASK_CELLS", 100)
+    try:
+        results = compute.compute_blocks(_sparse_blocks(30), "process", 2)
+        next(results)
+        assert _scratch_files()
+        results.close()
+        assert not _scratch_files()
+    finally:
+        compute.get_pool(2).shutdown()
+        compute.get_pool.cache_clear()
+
+
+def test_a_small_study_stays_in_process(monkeypatch):
+    def no_pool(workers):
+        raise AssertionError("pool started")
+
+    monkeypatch.setattr(compute, "get_pool", no_pool)
+    cells = _merged(compute.compute_blocks(_sparse_blocks(3), "process", 4))
+    assert len(cells) == 4
+
+
+def _break(pool):
+    with pytest.raises(BrokenProcessPool):
+        pool.submit(os._exit, 1).result()
+
+
+def test_broken_pool_falls_back_and_is_replaced(block, pool_backend):
+    values, idx, isos, tickers = block
+    serial = compute.compute_block(values, idx, isos, tickers, STEPS, LABELS)
+    broken = compute.get_pool(3)
+    _break(broken)
+
+    args = (values, idx, isos, tickers, STEPS, LABELS, "process", 3)
+    assert compute.compute_block(*args) == serial
+    assert compute.get_pool(3) is not broken
+    assert compute.compute_block(*args) == serial  # on the fresh pool
+
+
+def test_broken_pool_falls_back_for_batched_blocks(monkeypatch):
+    monkeypatch.setattr(compute, "MIN_PARALLEL_CELLS", 200)
+    monkeypatch.setattr(compute, "TASK_CELLS", 100)
+    try:
+        broken = compute.get_pool(2)
+        _break(broken)
+        serial = _merged(compute.compute_blocks(_sparse_blocks(30)))
+        pooled = _merged(compute.compute_blocks(_sparse_blocks(30), "process", 2))
+        assert pooled == serial
+        assert compute.get_pool(2) is not broken
+    finally:
+        compute.get_pool(2).shutdown()
+        compute.get_pool.cache_clear()
@@ -0,0 +1,54 @@
+import csv
+import io
+from datetime import date
+
+import pytest
+
+from catalog.export import COLUMNS, _arrow_chunks, _csv_chunks
+
+ROWS = [
+    (1, "Brexit vote", "daily", "2016-06-24", t, h, v)
+    for t in ("SPY", "EWU")
+    for h, v in (("1D", -0.03), ("1W", None))
+]
+
+
+def test_csv_is_streamed_in_batches_with_one_header():
+    chunks = list(_csv_chunks(iter(ROWS), batch_rows=3))
+    assert len(chunks) == 2
+    parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert parsed[0] == COLUMNS
+    assert parsed[1] == [
+        "1",
+        "Brexit vote",
+        "daily",
+        "2016-06-24",
+        "SPY",
+        "1D",
+        "-0.03",
+    ]
+    assert len(parsed) == 1 + len(ROWS)
+
+
+def test_header_only_when_empty():
+    assert b"".join(_csv_chunks(iter([]), batch_rows=3)).decode().split() == [
+        ",".join(COLUMNS)
+    ]
+
+
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+def test_arrow_formats_round_trip(fmt):
+    pa = pytest.importorskip("pyarrow")
+    chunks = list(_arrow_chunks(pa, iter(ROWS), 3, fmt))
+    assert len(chunks) >= 2
+    data = pa.BufferReader(b"".join(chunks))
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(data)
+    else:
+        table = pa.ipc.open_stream(data).read_all()
+    assert table.column_names == COLUMNS
+    assert table.num_rows == len(ROWS)
+    assert table["event_date"][0].as_py() == date(2016, 6, 24)
+    assert table["value"].to_pylist() == [r[6] for r in ROWS]
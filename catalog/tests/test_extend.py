@@ -0,0 +1,74 @@
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from catalog import extend
+from catalog.extend import new_blocks
+from catalog.models import AnalysisPost
+from catalog.results import aggregate
+
+
+def test_new_blocks_cover_only_new_cells():
+    dates, tickers = ["2020-01-02", "2020-02-03"], ["AAA", "BBB"]
+    blocks = new_blocks(dates, tickers, ["2020-03-02", "2020-01-02"], ["CCC", "AAA"])
+    assert blocks == [
+        (["2020-03-02"], ["AAA", "BBB", "CCC"]),
+        (["2020-01-02", "2020-02-03"], ["CCC"]),
+    ]
+    cells = {(d, t) for ds, ts in blocks for d in ds for t in ts}
+    assert len(cells) == sum(len(ds) * len(ts) for ds, ts in blocks)  # disjoint
+
+
+def test_new_blocks_nothing_new():
+    assert new_blocks(["2020-01-02"], ["AAA"], ["2020-01-02"], ["AAA"]) == []
+
+
+@pytest.fixture
+def post(db):
+    author = User.objects.create_user("author")
+    results = {
+        d: {t: {"1D": 0.01, "1W": None} for t in ["AAA", "BBB"]}
+        for d in ["2020-01-02", "2020-02-03"]
+    }
+    return AnalysisPost.objects.create(
+        author=author,
+        title="Study",
+        prompt_text="Study",
+        events_data=[{"date": d} for d in results],
+        results_data=results,
+        aggregates=aggregate(results),
+    )
+
+
+def test_extend_analysis_computes_and_stores_only_new_cells(post, monkeypatch):
+    calls = []
+
+    def fake_returns(dates, tickers):
+        calls.append(([d.isoformat() for d in dates], list(tickers)))
+        return {
+            d.isoformat(): {t: {"1D": 0.03, "1W": None} for t in tickers} for d in dates
+        }
+
+    monkeypatch.setattr(extend, "daily_event_returns", fake_returns)
+    added = extend.extend_analysis(post, ["2020-03-02", "2020-01-02"], ["CCC"])
+
+    assert calls == [
+        (["2020-03-02"], ["AAA", "BBB", "CCC"]),
+        (["2020-01-02", "2020-02-03"], ["CCC"]),
+    ]
+    assert added == 5
+    post.refresh_from_db()
+    assert extend.study_axes(post) == (
+        ["2020-01-02", "2020-02-03", "2020-03-02"],
+        ["AAA", "BBB", "CCC"],
+    )
+    assert post.results_data["2020-01-02"]["AAA"]["1D"] == 0.01
+    assert post.aggregates == aggregate(post.results_data)
+
+
+def test_extend_view_rejects_a_bad_time(post, client):
+    client.force_login(post.author)
+    url = reverse("catalog:analysis_extend", args=[post.pk])
+    resp = client.post(url, {"dates": "2024-05-01 noon"})
+    assert resp.status_code == 200
+    assert "Not a time (HH:MM): noon" in resp.content.decode()
@@ -0,0 +1,203 @@
+import os
+import resource
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from catalog import intraday
+
+
+def _write_session(symbol, day, closes, interval="5m", open_=None):
+    """Cache one regular session of 5m bars with the given closes."""
+    open_ns, _ = intraday._session_bounds(day)
+    step = 5 * intraday._NS_PER_MIN
+    ts = open_ns + step * np.arange(len(closes) + 1, dtype="int64")
+    prices = [closes[0] if open_ is None else open_, *closes]
+    ts_path, close_path = intraday._paths(symbol, day, interval)
+    ts_path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(ts_path, ts)
+    np.save(close_path, np.asarray(prices, dtype="float32"))
+
+
+@pytest.fixture
+def bar_cache(settings, tmp_path, monkeypatch):
+    settings.INTRADAY_CACHE_DIR = str(tmp_path)
+    settings.INTRADAY_INTERVAL = "5m"
+    intraday._past_session.cache_clear()
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("cache miss")
+
+    monkeypatch.setattr(intraday, "_fetch", no_network)
+    yield
+    intraday._past_session.cache_clear()
+
+
+def test_returns_at_each_horizon(bar_cache):
+    day = date(2024, 3, 20)
+    _write_session("AAA", day, np.linspace(100, 177, 78))  # +1 per 5m bar
+    event = intraday.event_timestamp("2024-03-20", "14:00")
+
+    cell = intraday.intraday_event_returns([event], ["AAA"])["2024-03-20"]["AAA"]
+
+    # 14:00 is the close of bar 54 (price 153)
+    assert cell["5m"] == pytest.approx(154 / 153 - 1)
+    assert cell["30m"] == pytest.approx(159 / 153 - 1)
+    assert cell["1h"] == pytest.approx(165 / 153 - 1)
+    assert cell["EOD"] == pytest.approx(177 / 153 - 1)
+
+
+@pytest.mark.parametrize("hhmm", ["09:30", "09:31", None])
+def test_event_before_first_bar_closes_uses_the_open(bar_cache, hhmm):
+    _write_session("AAA", date(2024, 3, 20), np.linspace(100, 177, 78), open_=99)
+    event = intraday.event_timestamp("2024-03-20", hhmm)
+    cell = intraday.intraday_event_returns([event], ["AAA"])["2024-03-20"]["AAA"]
+    assert cell["5m"] == pytest.approx(100 / 99 - 1)
+    assert cell["30m"] == pytest.approx(105 / 99 - 1)
+    assert cell["EOD"] == pytest.approx(177 / 99 - 1)
+
+
+def test_fetch_prepends_the_opening_row(monkeypatch):
+    starts = pd.date_range(
+        "2024-03-20 09:30", periods=3, freq="5min", tz=intraday.MARKET_TZ
+    )
+    hist = pd.DataFrame({"Open": [99.0, 100, 101], "Close": [100.0, 101, 102]}, starts)
+    fake = SimpleNamespace(history=lambda **kwargs: hist)
+    monkeypatch.setattr(intraday, "ticker", lambda symbol: fake)
+
+    ts, close = intraday._fetch("AAA", date(2024, 3, 20), "5m")
+    open_ns, _ = intraday._session_bounds(date(2024, 3, 20))
+    assert ts[0] == open_ns and ts[1] == open_ns + 5 * intraday._NS_PER_MIN
+    assert close.tolist() == [99, 100, 101, 102]
+
+
+def test_late_event_keeps_only_eod(bar_cache):
+    _write_session("AAA", date(2024, 3, 20), np.linspace(100, 177, 78))
+    event = intraday.event_timestamp("2024-03-20", "15:30")
+    cell = intraday.intraday_event_returns([event], ["AAA"])["2024-03-20"]["AAA"]
+    assert cell["1h"] is None
+    assert cell["EOD"] == pytest.approx(177 / 171 - 1)
+
+
+def test_cached_study_is_fast(bar_cache):
+    days = [date(2024, 1, 2) + timedelta(days=i) for i in range(50)]
+    tickers = [f"T{i:02d}" for i in range(20)]
+    rng = np.random.default_rng(0)
+    for tkr in tickers:
+        for day in days:
+            _write_session(tkr, day, 100 + rng.standard_normal(78).cumsum())
+    events = [intraday.event_timestamp(d.isoformat(), "10:00") for d in days]
+
+    started = time.perf_counter()
+    results = intraday.intraday_event_returns(events, tickers)
+    assert time.perf_counter() - started < 1.0
+    assert len(results) == 50 and all(len(cells) == 20 for cells in results.values())
+
+
+def test_only_past_sessions_with_bars_are_cached(settings, tmp_path, monkeypatch):
+    settings.INTRADAY_CACHE_DIR = str(tmp_path)
+    intraday._past_session.cache_clear()
+    calls = []
+
+    def fetch(symbol, day, interval):
+        calls.append(symbol)
+        n = 0 if symbol == "GAP" else 3
+        return np.arange(n, dtype="int64"), np.ones(n, dtype="float32")
+
+    monkeypatch.setattr(intraday, "_fetch", fetch)
+    past, today = date(2024, 3, 20), date.today() + timedelta(days=1)
+    for _ in range(2):
+        assert len(intraday.session_bars("AAA", past, "5m")[0]) == 3
+        assert len(intraday.session_bars("GAP", past, "5m")[0]) == 0
+        assert len(intraday.session_bars("AAA", today, "5m")[0]) == 3
+    assert calls == ["AAA", "GAP", "AAA", "GAP", "AAA"]
+    assert intraday._paths("AAA", past, "5m")[0].exists()
+    assert not intraday._paths("GAP", past, "5m")[0].exists()
+    assert not intraday._paths("AAA", today, "5m")[0].exists()
+    intraday._past_session.cache_clear()
+
+
+@pytest.fixture
+def few_descriptors():
+    """Lower the open-file limit to a few dozen above what is open now."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    in_use = len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else 64
+    resource.setrlimit(resource.RLIMIT_NOFILE, (in_use + 48, hard))
+    yield
+    resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+
+def test_cached_sessions_do_not_hold_file_descriptors(bar_cache, few_descriptors):
+    days = [d.date() for d in pd.bdate_range("2024-01-02", periods=40)]
+    tickers = ["AAA", "BBB", "CCC"]
+    for tkr in tickers:
+        for day in days:
+            _write_session(tkr, day, np.linspace(100, 177, 78))
+    events = [intraday.event_timestamp(d.isoformat(), "10:00") for d in days]
+    # 120 sessions, 240 files: far more than the descriptors left
+    results = intraday.intraday_event_returns(events, tickers)
+    assert len(results) == 40 and all(len(c) == 3 for c in results.values())
+
+
+@pytest.mark.django_db
+def test_wizard_rejects_a_bad_event_time(client):
+    from django.contrib.auth.models import User
+    from django.urls import reverse
+
+    client.force_login(User.objects.create_user("user"))
+    session = client.session
+    session.update(
+        {
+            "step": 2,
+            "mode": "intraday",
+            "post_id": 1,
+            "title": "Fed",
+            "events_info": [{"date": "2024-03-20", "description": "FOMC"}],
+        }
+    )
+    session.save()
+    resp = client.post(
+        reverse("catalog:chat_flow"),
+        {"events": ["2024-03-20"], "time_2024-03-20": "noon"},
+    )
+    assert resp.status_code == 200
+    assert "Not a time (HH:MM) for 2024-03-20: noon" in resp.content.decode()
+    assert client.session["step"] == 2
+    assert "event_times" not in client.session
+
+
+@pytest.mark.parametrize(
+    "when, expected",
+    [
+        ("2024-03-20 14:00", "2024-03-20 14:00"),
+        ("2024-03-20 08:30", "2024-03-20 09:30"),  # pre-market CPI
+        ("2024-03-20 16:05", "2024-03-21 09:30"),  # after-close earnings
+        ("2024-03-20 16:00", "2024-03-21 09:30"),
+        ("2024-03-22 17:00", "2024-03-25 09:30"),  # Friday evening → Monday
+        ("2024-03-23 10:00", "2024-03-25 09:30"),  # Saturday
+    ],
+)
+def test_reaction_start(when, expected):
+    day, hhmm = when.split()
+    start = intraday.reaction_start(intraday.event_timestamp(day, hhmm))
+    assert start == intraday.event_timestamp(*expected.split())
+
+
+def test_events_outside_the_session_count_from_the_next_open(bar_cache):
+    _write_session("AAA", date(2024, 3, 20), np.linspace(100, 177, 78), open_=99)
+    _write_session("AAA", date(2024, 3, 21), np.linspace(200, 277, 78), open_=198)
+    before = intraday.event_timestamp("2024-03-20", "08:30")
+    after = intraday.event_timestamp("2024-03-19", "16:05")
+    results = intraday.intraday_event_returns([before, after], ["AAA"])
+
+    # Keyed by the event's own date, measured from the next opening bell
+    assert results["2024-03-20"]["AAA"]["5m"] == pytest.approx(100 / 99 - 1)
+    assert results["2024-03-19"]["AAA"]["EOD"] == pytest.approx(177 / 99 - 1)
+    late = intraday.event_timestamp("2024-03-20", "16:05")
+    cell = intraday.intraday_event_returns([late], ["AAA"])["2024-03-20"]["AAA"]
+    assert cell["5m"] == pytest.approx(200 / 198 - 1)
+    assert cell["EOD"] == pytest.approx(277 / 198 - 1)
@@ -0,0 +1,118 @@
+import io
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from catalog import loadtest, prices, utils
+from catalog.clients import llm
+from catalog.models import AnalysisPost
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    with loadtest.StubLLM() as stub:
+        monkeypatch.setenv("OPENAI_BASE_URL", f"{stub.url}/v1")
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        llm.cache_clear()
+        yield stub
+    llm.cache_clear()
+
+
+def test_stub_llm_answers_the_wizard_prompts(stub_llm):
+    dates = utils.generate_dates("Fed rate hikes")
+    assert dates.confirmed and dates.events
+    assert all(d.weekday() < 5 for d in dates.events)
+    assert utils.generate_dates("Fed rate hikes").events == dates.events
+
+    stocks = utils.generate_stocks("Fed rate hikes", limit=3).stocks
+    assert set(stocks.positive + stocks.negative) <= set(loadtest.STUB_SYMBOLS)
+    assert stub_llm.requests == 3
+
+
+def test_stub_prices_serve_the_price_service_protocol(settings):
+    cache.clear()
+    with loadtest.StubPrices() as stub:
+        settings.PRICE_SERVICE_URL = stub.url
+        closes = prices._fetch_closes("AAPL", date(2020, 1, 1), date(2020, 2, 1))
+        info = prices.ticker_info("AAPL")
+        prices.ticker_info("AAPL")
+        assert stub.requests == 2
+    cache.clear()
+    assert len(closes) == 23
+    assert closes.index.min().date() == date(2020, 1, 1)
+    assert (closes > 0).all()
+    assert info["longName"] == "AAPL (stub)"
+
+
+def test_summarize_percentiles_and_errors():
+    samples = [
+        loadtest.Sample("chat:topic", i / 1000, True, 200) for i in range(1, 101)
+    ]
+    samples += [
+        loadtest.Sample("chat:stocks", 0.5, True, 302),
+        loadtest.Sample("chat:stocks", 0.5, False, 500),
+        loadtest.Sample("other", 0.1, False, 0),
+    ]
+    report = loadtest.summarize(samples, wall_seconds=10.0)
+
+    topic = report["endpoints"]["chat:topic"]
+    assert topic["requests"] == 100 and topic["errors"] == 0
+    assert topic["p50_ms"] == pytest.approx(50.5)
+    assert topic["p99_ms"] == pytest.approx(99.01)
+    assert topic["rps"] == pytest.approx(10.0)
+    assert report["endpoints"]["chat:stocks"]["error_rate"] == 0.5
+    assert list(report["endpoints"]) == ["chat:topic", "chat:stocks", "other"]
+    assert report["wizards_completed"] == 1
+    assert report["wizards_per_minute"] == pytest.approx(6.0)
+    assert "1 wizard runs completed" in loadtest.format_report(report)
+
+
+def test_command_refuses_to_run_without_debug(settings):
+    settings.DEBUG = False
+    with pytest.raises(CommandError, match="--allow-production"):
+        call_command("loadtest", users=1)
+
+
+@pytest.mark.django_db
+def test_command_users_are_temporary():
+    from catalog.management.commands.loadtest import Command
+
+    command = Command(stdout=io.StringIO())
+    names = command._users(2, "s3cret-pass")
+    other = User.objects.create_user("loadtest-0")
+    user = User.objects.get(username=names[0])
+    assert user.check_password("s3cret-pass")
+    AnalysisPost.objects.create(author=user, title="t", prompt_text="t")
+
+    command._cleanup(names)
+    assert not User.objects.filter(username__in=names).exists()
+    assert not AnalysisPost.objects.exists()
+    assert User.objects.filter(pk=other.pk).exists()
+
+
+def test_rate_options_override_the_scheduler_limits(settings, monkeypatch):
+    from catalog.management.commands.loadtest import Command
+    from catalog.scheduler import get_scheduler
+
+    # So the variables the command sets are restored afterwards
+    monkeypatch.setenv("OPENAI_BASE_URL", "http://unused/v1")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    settings.UPSTREAM_RATE_LIMITS = {"llm": (5.0, 10), "prices": (2.0, 5)}
+    command = Command(stdout=io.StringIO())
+    limits = command._rate_limits(None, 50.0)
+    assert limits == {"llm": (5.0, 10), "prices": (50.0, 5)}
+    with pytest.raises(CommandError, match="--llm-rate"):
+        command._rate_limits(0, None)
+
+    with loadtest.StubLLM() as stub_llm, loadtest.StubPrices() as stub_prices:
+        try:
+            command._point_clients_at(stub_llm, stub_prices, limits)
+            assert settings.UPSTREAM_RATE_LIMITS == limits
+            assert get_scheduler()._buckets["prices"].rate == 50.0
+        finally:
+            llm.cache_clear()
+            get_scheduler.cache_clear()
@@ -0,0 +1,68 @@
+import threading
+from datetime import date
+
+import pytest
+from django.core.cache import cache
+
+from catalog import prefetch, prices, utils
+from catalog.schemas import StockResponse
+
+
+@pytest.fixture
+def fake_upstreams(monkeypatch, settings):
+    settings.PREFETCH_ENABLED = True
+    settings.PREFETCH_MAX_PENDING = 1
+    prefetch._slots.cache_clear()
+    release = threading.Event()
+    warmed = []
+
+    def stocks(topic, limit=None):
+        release.wait(5)
+        return StockResponse(
+            stocks={"positive": ["AAPL"], "negative": ["XOM"]}, message=""
+        )
+
+    monkeypatch.setattr(utils, "generate_stocks", stocks)
+    monkeypatch.setattr(prices, "ticker_info", lambda t: warmed.append(("info", t)))
+    monkeypatch.setattr(
+        prices, "daily_closes", lambda t, start, end: warmed.append((t, start, end))
+    )
+    cache.clear()
+    yield release, warmed
+    release.set()
+    prefetch._executor().shutdown(wait=True)
+    prefetch._executor.cache_clear()
+    prefetch._slots.cache_clear()
+    cache.clear()
+
+
+def test_suggestions_and_prices_are_warmed_in_the_background(fake_upstreams):
+    release, warmed = fake_upstreams
+    assert prefetch.speculate(7, "oil shock", ["2020-03-09"], "daily")
+    assert prefetch.speculative_stocks(7) is None  # still running
+    release.set()
+    resp = prefetch.speculative_stocks(7, wait=5)
+    assert resp.stocks.positive == ["AAPL"]
+    prefetch._executor().shutdown(wait=True)
+    assert ("info", "XOM") in warmed
+    assert any(w[0] == "AAPL" and str(w[1]) == "2020-02-28" for w in warmed)
+
+
+def test_speculation_is_dropped_when_saturated(fake_upstreams):
+    release, _ = fake_upstreams
+    assert prefetch.speculate(1, "a", ["2020-03-09"], "daily")
+    assert not prefetch.speculate(2, "b", ["2020-03-09"], "daily")
+    release.set()
+    assert prefetch.speculative_stocks(1, wait=5) is not None
+
+
+def test_prices_are_warmed_for_the_windows_step_3_loads(fake_upstreams):
+    release, warmed = fake_upstreams
+    release.set()
+    assert prefetch.speculate(3, "oil", ["2020-03-09", "2001-05-01"], "daily")
+    prefetch._executor().shutdown(wait=True)
+    spans = [w[1:] for w in warmed if w[0] == "AAPL"]
+    assert spans == [
+        (date(2001, 4, 21), date(2001, 7, 10)),
+        (date(2020, 2, 28), date(2020, 5, 18)),
+    ]
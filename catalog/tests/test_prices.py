@@ -0,0 +1,70 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+from django.core.cache import cache
+
+from catalog import prices
+
+
+@pytest.fixture
+def fake_yahoo(monkeypatch):
+    calls = []
+    days = pd.bdate_range("2018-01-01", "2021-12-31")
+    closes = pd.Series(range(len(days)), index=days, dtype="float64")
+
+    def fetch(symbol, start, end):
+        calls.append((start, end))
+        return closes[(closes.index >= str(start)) & (closes.index < str(end))]
+
+    cache.clear()
+    monkeypatch.setattr(prices, "_fetch_closes", fetch)
+    yield calls
+    cache.clear()
+
+
+def test_daily_closes_fetch_each_year_once(fake_yahoo):
+    first = prices.daily_closes("AAA", date(2019, 12, 20), date(2020, 2, 1))
+    assert fake_yahoo == [(date(2019, 1, 1), date(2021, 1, 1))]
+    assert first.index.min() == pd.Timestamp("2019-12-20")
+    assert first.index.max() < pd.Timestamp("2020-02-01")
+
+    prices.daily_closes("AAA", date(2020, 6, 1), date(2021, 3, 1))
+    assert fake_yahoo[1:] == [(date(2021, 1, 1), date(2022, 1, 1))]
+
+
+def test_stored_closes_are_served_without_fetching(fake_yahoo):
+    days = pd.bdate_range("2010-01-01", "2011-12-31")
+    prices.store_closes("SEED", pd.Series(1.0, index=days))
+    got = prices.daily_closes("SEED", date(2010, 6, 1), date(2011, 6, 1))
+    assert fake_yahoo == []
+    assert got.name == "SEED"
+    assert got.index.min() == pd.Timestamp("2010-06-01")
+
+
+def test_empty_years_are_cached_briefly(fake_yahoo, monkeypatch, settings):
+    ttls = {}
+    real_set = cache.set
+
+    def record(key, value, timeout=None):
+        ttls[key] = timeout
+        real_set(key, value, timeout)
+
+    monkeypatch.setattr(cache, "set", record)
+    prices.daily_closes("AAA", date(2016, 6, 1), date(2018, 6, 1))
+    assert ttls == {
+        "prices:daily:AAA:2016": prices._EMPTY_YEAR_TTL,
+        "prices:daily:AAA:2017": prices._EMPTY_YEAR_TTL,
+        "prices:daily:AAA:2018": settings.PRICE_CACHE_TTL,
+    }
+
+
+def test_price_service_data_is_cached_apart_from_yahoo(fake_yahoo, settings):
+    prices.daily_closes("AAA", date(2019, 1, 2), date(2019, 2, 1))
+    settings.PRICE_SERVICE_URL = "http://127.0.0.1:9999"
+    prices.daily_closes("AAA", date(2019, 1, 2), date(2019, 2, 1))
+    assert len(fake_yahoo) == 2  # the service's year is not Yahoo's
+    assert prices._year_key("AAA", 2019) != "prices:daily:AAA:2019"
+    settings.PRICE_SERVICE_URL = None
+    prices.daily_closes("AAA", date(2019, 1, 2), date(2019, 2, 1))
+    assert len(fake_yahoo) == 2
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+
+from catalog.models import AnalysisPost
+from catalog.ranking import hot_score
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_votes_raise_and_lower_score():
+    assert hot_score(10, 0, NOW) > hot_score(1, 0, NOW) > hot_score(0, 5, NOW)
+    assert hot_score(3, 3, NOW) == hot_score(0, 0, NOW)
+
+
+def test_recency_is_worth_a_factor_of_ten_per_12_5_hours():
+    older = NOW - timedelta(seconds=45000)
+    assert hot_score(10, 0, older) == hot_score(1, 0, NOW)
+    assert hot_score(5, 0, older) < hot_score(1, 0, NOW)
+
+
+@pytest.fixture
+def feed(db):
+    cache.clear()
+    author = User.objects.create_user("author")
+    # Scores with ties, so the feed has to fall back to -id within a score
+    scores = [3.0, 5.0, 3.0, 1.0, 3.0, 5.0, 2.0]
+    posts = [
+        AnalysisPost.objects.create(author=author, title=f"P{i}", prompt_text="x")
+        for i in range(len(scores))
+    ]
+    for post, score in zip(posts, scores):
+        AnalysisPost.objects.filter(pk=post.pk).update(hot_score=score)
+    ranked = sorted(zip(scores, posts), key=lambda sp: (-sp[0], -sp[1].pk))
+    yield author, [post for _, post in ranked]
+    cache.clear()
+
+
+def _walk(client, n):
+    pks, cursors, url = [], [], f"{reverse('catalog:analysis_top')}?n={n}"
+    while True:
+        resp = client.get(url)
+        pks += [p.pk for p in resp.context["posts"]]
+        cursor = resp.context["next_cursor"]
+        if cursor is None:
+            return pks, cursors
+        cursors.append(cursor)
+        url = f"{reverse('catalog:analysis_top')}?n={n}&after={cursor}"
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 20])
+def test_top_feed_pages_cover_every_post_once_in_order(feed, client, n):
+    author, expected = feed
+    client.force_login(author)
+    pks, cursors = _walk(client, n)
+    assert pks == [p.pk for p in expected]
+    assert len(cursors) == (len(expected) - 1) // n
+
+
+def test_top_feed_pages_are_stable_when_posts_are_added(feed, client):
+    author, expected = feed
+    client.force_login(author)
+    first = client.get(reverse("catalog:analysis_top") + "?n=3")
+    cursor = first.context["next_cursor"]
+    # A new post in a tie with the page boundary sorts before it (higher id)
+    new = AnalysisPost.objects.create(author=author, title="New", prompt_text="x")
+    AnalysisPost.objects.filter(pk=new.pk).update(hot_score=3.0)
+    rest = client.get(reverse("catalog:analysis_top") + f"?n=20&after={cursor}")
+    seen = [p.pk for p in first.context["posts"]] + [
+        p.pk for p in rest.context["posts"]
+    ]
+    assert seen == [p.pk for p in expected]
+
+
+def test_anonymous_pages_are_served_from_the_cache(feed, client, settings):
+    author, expected = feed
+    url = reverse("catalog:analysis_top") + "?n=2"
+    first = client.get(url)
+    assert f"max-age={settings.TOP_FEED_CACHE_SECONDS}" in first["Cache-Control"]
+    assert "public" in first["Cache-Control"]
+
+    AnalysisPost.objects.filter(pk=expected[-1].pk).update(hot_score=99.0)
+    again = client.get(url)
+    assert again.content == first.content
+    assert "public" in again["Cache-Control"]
+
+    client.force_login(author)
+    fresh = client.get(url)
+    assert fresh.context["posts"][0].pk == expected[-1].pk
+    assert "public" not in fresh.get("Cache-Control", "")
+
+
+def test_bad_cursor_starts_from_the_top(feed, client):
+    author, expected = feed
+    client.force_login(author)
+    resp = client.get(reverse("catalog:analysis_top") + "?n=2&after=nonsense")
+    assert [p.pk for p in resp.context["posts"]] == [p.pk for p in expected[:2]]
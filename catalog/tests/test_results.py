@@ -0,0 +1,38 @@
+import pytest
+
+from catalog.results import (
+    aggregate,
+    matrix_from_aggregates,
+    mean_matrix,
+    merge_cells,
+)
+
+
+def test_mean_matrix_orders_horizons_and_skips_missing():
+    results = {
+        "2020-01-02": {"AAA": {"1W": 0.2, "1D": 0.1}, "BBB": {"1D": None}},
+        "2020-02-03": {"AAA": {"1W": 0.4, "1D": 0.3}},
+    }
+    matrix = mean_matrix(results)
+    assert matrix["tickers"] == ["AAA", "BBB"]
+    assert matrix["horizons"] == ["1D", "1W"]
+    assert matrix["z"][0] == pytest.approx([0.2, 0.3])
+    assert matrix["z"][1] == [None, None]
+
+
+def test_merged_aggregates_match_full_recompute():
+    first = {"2020-01-02": {"AAA": {"1D": 0.1, "1W": None}}}
+    later = {
+        "2020-03-02": {"AAA": {"1D": 0.3, "1W": 0.5}},
+        "2020-01-02": {"BBB": {"1D": -0.2, "1W": 0.0}},
+    }
+    incremental = merge_cells(aggregate(first), later)
+    full = aggregate({**first, "2020-03-02": later["2020-03-02"]})
+    full = merge_cells(full, {"2020-01-02": later["2020-01-02"]})
+    assert incremental == full
+    assert matrix_from_aggregates(incremental) == mean_matrix(
+        {
+            "2020-01-02": {**first["2020-01-02"], **later["2020-01-02"]},
+            "2020-03-02": later["2020-03-02"],
+        }
+    )
@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from catalog import returns
+
+DAYS = pd.bdate_range("1995-01-01", "2024-12-31")
+TICKERS = [f"T{i:02d}" for i in range(12)]
+
+
+@pytest.fixture
+def fake_closes(monkeypatch):
+    rng = np.random.default_rng(1)
+    walk = pd.DataFrame(
+        100 + rng.standard_normal((len(DAYS), len(TICKERS))).cumsum(axis=0) / 10,
+        index=DAYS,
+        columns=TICKERS,
+    )
+    requested = []
+
+    def closes(symbol, start, end):
+        requested.append((symbol, start, end))
+        s = walk[symbol]
+        return s[(s.index >= pd.Timestamp(start)) & (s.index < pd.Timestamp(end))]
+
+    monkeypatch.setattr(returns, "daily_closes", closes)
+    return requested
+
+
+EVENTS = [date(1998, 8, 31), date(1998, 9, 15), date(2008, 9, 15), date(2020, 3, 16)]
+
+
+def test_windows_merge_overlaps_and_respect_max_days():
+    assert returns.event_windows(EVENTS) == [EVENTS[:2], [EVENTS[2]], [EVENTS[3]]]
+    assert returns.event_windows(EVENTS, max_days=85) == [[d] for d in EVENTS]
+
+
+def test_only_event_windows_are_loaded(fake_closes):
+    stats = {}
+    returns.daily_event_returns(EVENTS, TICKERS[:2], stats=stats, trace_memory=True)
+    assert stats["windows"] == 3
+    assert stats["peak_bytes"] > 0
+    spans = {(start, end) for _, start, end in fake_closes}
+    assert max((end - start).days for start, end in spans) <= 80 + 15
+
+
+def test_memory_limit_splits_work_without_changing_results(fake_closes):
+    dates = [date(1995, 3, 1) + timedelta(days=41 * i) for i in range(120)]
+    whole = returns.daily_event_returns(dates, TICKERS, memory_limit=2**30)
+    stats = {}
+    chunked = returns.daily_event_returns(
+        dates, TICKERS, memory_limit=20_000, stats=stats
+    )
+    assert stats["chunks"] > 10
+    assert chunked == whole
+    assert list(chunked) == [d.isoformat() for d in dates]
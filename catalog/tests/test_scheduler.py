@@ -0,0 +1,99 @@
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from catalog.scheduler import (
+    BudgetExceeded,
+    Scheduler,
+    TokenBucket,
+    UpstreamUnavailable,
+    budget,
+)
+
+
+class _FlakyUpstream(BaseHTTPRequestHandler):
+    """Answers with the queued statuses, then 200."""
+
+    script: list = []
+
+    def do_GET(self):
+        status, headers = self.script.pop(0) if self.script else (200, {})
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyUpstream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+    yield url
+    server.shutdown()
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        return resp.read()
+
+
+def test_retries_and_honours_retry_after(upstream):
+    _FlakyUpstream.script = [(429, {"Retry-After": "3"}), (503, {})]
+    slept = []
+    scheduler = Scheduler({}, backoff_base=0.01, sleep=slept.append)
+
+    assert scheduler.call("prices", _get, upstream) == b"ok"
+    assert len(slept) == 2
+    assert slept[0] >= 3  # Retry-After wins over the jittered backoff
+    assert slept[1] <= 0.02
+
+
+def test_gives_up_after_max_retries(upstream):
+    _FlakyUpstream.script = [(502, {})] * 3
+    scheduler = Scheduler({}, max_retries=2, sleep=lambda s: None)
+    with pytest.raises(UpstreamUnavailable):
+        scheduler.call("prices", _get, upstream)
+
+
+def test_client_errors_are_not_retried(upstream):
+    _FlakyUpstream.script = [(404, {}), (404, {})]
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return _get(upstream)
+
+    with pytest.raises(Exception) as info:
+        Scheduler({}, sleep=lambda s: None).call("prices", fetch)
+    assert not isinstance(info.value, UpstreamUnavailable)
+    assert len(calls) == 1
+
+
+def test_budget_caps_wall_time(upstream):
+    _FlakyUpstream.script = [(429, {"Retry-After": "30"})]
+    scheduler = Scheduler({})
+    started = time.monotonic()
+    with budget(1.0), pytest.raises(BudgetExceeded):
+        scheduler.call("llm", _get, upstream)
+    assert time.monotonic() - started < 1.0
+
+
+def test_token_bucket_spaces_calls():
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2, capacity=1, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        bucket.acquire()
+    assert now[0] == pytest.approx(1.0)
@@ -0,0 +1,81 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+
+from catalog.models import AnalysisPost
+from catalog.search import build_document, search_posts
+
+on_postgres = connection.vendor == "postgresql"
+
+
+def test_document_covers_topic_events_and_tickers():
+    doc = build_document(
+        "Fed hike",
+        "Fed rate hikes since 2015",
+        [{"date": "2015-12-16", "description": "First hike in a decade"}, {}],
+        [{"ticker": "JPM", "name": "JPMorgan Chase"}, {"ticker": "TLT"}],
+    )
+    assert doc.splitlines() == [
+        "Fed hike",
+        "Fed rate hikes since 2015",
+        "First hike in a decade",
+        "JPM TLT",
+        "JPMorgan Chase",
+    ]
+
+
+def test_empty_query_matches_nothing():
+    assert list(search_posts("   ")) == []
+
+
+@pytest.mark.skipif(not on_postgres, reason="Postgres full-text search only")
+def test_postgres_query_uses_the_indexed_expression():
+    # Migration 0008 indexes to_tsvector(config, COALESCE(search_document, ''))
+    sql = str(search_posts("brexit vote").query)
+    where = sql.split(" WHERE ", 1)[1]
+    assert where.startswith(
+        'to_tsvector(english::regconfig, COALESCE("catalog_analysispost".'
+        '"search_document", )) @@ (websearch_to_tsquery('
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(on_postgres, reason="substring fallback for other backends")
+def test_fallback_matches_every_term_case_insensitively():
+    author = User.objects.create_user("author")
+
+    def post(title, events=(), stocks=(), score=0.0):
+        p = AnalysisPost.objects.create(
+            author=author,
+            title=title,
+            prompt_text=title,
+            events_data=list(events),
+            stocks_data=list(stocks),
+        )
+        AnalysisPost.objects.filter(pk=p.pk).update(hot_score=score)
+        return p.pk
+
+    brexit = post(
+        "Brexit referendum",
+        [{"date": "2016-06-23", "description": "Leave wins the vote"}],
+        [{"ticker": "EWU", "name": "iShares MSCI United Kingdom"}],
+        score=1.0,
+    )
+    brexit_hot = post("Brexit deadline", [{"description": "Extension vote"}], score=5.0)
+    apple = post("iPhone launches", stocks=[{"ticker": "AAPL", "name": "Apple Inc."}])
+
+    def ids(query):
+        return list(search_posts(query).values_list("pk", flat=True))
+
+    assert ids("BREXIT") == [brexit_hot, brexit]  # by hot score
+    assert ids("brexit vote") == [brexit_hot, brexit]
+    assert ids("brexit leave") == [brexit]  # every term must match
+    assert ids("ewu") == [brexit]
+    assert ids('"apple"') == [apple]
+    assert ids("tariffs") == []
+
+    # The document follows edits made through save()
+    p = AnalysisPost.objects.get(pk=apple)
+    p.stocks_data = [{"ticker": "MSFT"}]
+    p.save(update_fields=["stocks_data"])
+    assert ids("aapl") == [] and ids("msft") == [apple]
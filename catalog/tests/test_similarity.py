@@ -0,0 +1,139 @@
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from catalog import views
+from catalog.models import AnalysisPost
+from catalog.schemas import DatesResponse
+from catalog.similarity import TopicIndex, get_topic_index, reusable_topic
+
+TOPICS = [
+    "2008 financial crisis",
+    "Brexit vote",
+    "Fed rate hikes since 2015",
+    "Apple iPhone launches",
+    "Hurricane Katrina landfall",
+]
+
+
+def _index():
+    index = TopicIndex()
+    for pk, text in enumerate(TOPICS, start=1):
+        index.add(pk, text)
+    return index
+
+
+def test_reworded_topic_is_nearest_and_above_threshold():
+    (pk, score), *_ = _index().nearest("global financial crisis 2008")
+    assert pk == 1
+    assert score > 0.75
+
+
+def test_unrelated_topic_scores_low():
+    assert all(s < 0.3 for _, s in _index().nearest("Enron bankruptcy filing"))
+
+
+def test_add_grows_incrementally_and_ignores_repeats():
+    index = _index()
+    for pk in range(6, 2000):
+        index.add(pk, f"topic number {pk}")
+    index.add(1, "something else entirely")
+    assert len(index) == 1999
+    assert index.last_pk == 1999
+    assert index.nearest("financial crisis 2008", k=1)[0][0] == 1
+
+
+def test_rows_are_stored_sparsely():
+    index = TopicIndex()
+    for pk in range(1, 5001):
+        index.add(pk, f"Fed rate decision number {pk}")
+    index.add(5001, "the of and")  # stopwords only: counted, never matched
+    stored = sum(
+        a.nbytes for a in (index._buckets, index._weights, index._starts, index._pks)
+    )
+    assert len(index) == 5001
+    assert stored < 5000 * 600  # a dense float32 row alone is 4 KB
+    # Numbers hash to one bucket each, so a few other posts may tie with it
+    best = dict(index.nearest("Fed rate decision number 4321", k=20))
+    assert best[4321] == pytest.approx(1.0)
+
+
+@pytest.fixture
+def wizard(db, client, settings, monkeypatch):
+    settings.LLM_ONE_SHOT = False
+    settings.TOPIC_REUSE_THRESHOLD = 0.5
+    get_topic_index.cache_clear()
+    calls = []
+
+    def fake_dates(query):
+        calls.append(query)
+        return DatesResponse(confirmed=True, events=[date(2009, 3, 9)], message="")
+
+    monkeypatch.setattr(views, "generate_dates", fake_dates)
+    monkeypatch.setattr(views, "summarize_event", lambda topic, iso: "Fresh")
+    monkeypatch.setattr(views, "speculate", lambda *args, **kwargs: False)
+    user = User.objects.create_user("user")
+    AnalysisPost.objects.create(
+        author=user,
+        title="2008 financial crisis",
+        prompt_text="2008 financial crisis",
+        events_data=[{"date": "2008-09-15", "description": "Lehman files"}],
+    )
+    client.force_login(user)
+    yield client, calls
+    get_topic_index.cache_clear()
+
+
+def _events_of_new_post():
+    return AnalysisPost.objects.latest("pk").events_data
+
+
+def test_near_duplicate_topic_reuses_dates(wizard):
+    client, calls = wizard
+    client.get(reverse("catalog:chat_flow"))
+    client.post(reverse("catalog:chat_flow"), {"query": "global financial crisis 2008"})
+    assert calls == []
+    assert _events_of_new_post() == [
+        {"date": "2008-09-15", "description": "Lehman files"}
+    ]
+
+
+def test_run_anyway_skips_reuse(wizard):
+    client, calls = wizard
+    client.get(reverse("catalog:chat_flow"))
+    client.post(
+        reverse("catalog:chat_flow"),
+        {"query": "global financial crisis 2008", "force": "1"},
+    )
+    assert calls == ["global financial crisis 2008"]
+    assert _events_of_new_post() == [{"date": "2009-03-09", "description": "Fresh"}]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "stored, query",
+    [
+        ("Apple earnings 2019", "Apple earnings 2020"),
+        ("Tesla stock split 2020", "Tesla stock split 2022"),
+        ("2008 financial crisis", "2009 financial crisis"),
+        ("2000 dot-com crash", "2001 dot-com crash"),
+        ("2008 financial crisis", "financial crisis"),
+    ],
+)
+def test_topics_with_different_numbers_are_not_reused(stored, query):
+    get_topic_index.cache_clear()
+    author = User.objects.create_user("author")
+    for title in (stored, "Brexit vote", "Fed rate hikes"):
+        AnalysisPost.objects.create(
+            author=author,
+            title=title,
+            prompt_text=title,
+            events_data=[{"date": "2020-01-02", "description": ""}],
+        )
+    try:
+        assert reusable_topic(query) is None
+        assert reusable_topic(stored.lower())[0].prompt_text == stored
+    finally:
+        get_topic_index.cache_clear()
@@ -0,0 +1,46 @@
+"""Import-time budget: loading the app must not pull in the heavy SDKs."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Modules that must only be imported by the code paths that use them
+HEAVY_MODULES = ("openai", "pandas", "plotly", "yfinance")
+
+# Generous wall-clock ceiling for django.setup() + URLconf/views import
+IMPORT_BUDGET_SECONDS = 2.0
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import django
+django.setup()
+import catalog.urls, catalog.views, catalog.utils
+elapsed = time.perf_counter() - t0
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _probe():
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE="event_stock_response.settings")
+    env.pop("OPENAI_API_KEY", None)
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_app_import_is_light_and_needs_no_api_key():
+    result = _probe()
+    loaded = {m.split(".")[0] for m in result["modules"]}
+    assert not loaded.intersection(HEAVY_MODULES)
+    assert result["elapsed"] < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,32 @@
+from datetime import date
+
+from catalog.tickers import get_index, normalize_symbol, screen_tickers
+
+
+def test_normalize_symbol():
+    assert normalize_symbol(" nasdaq:aapl ") == "AAPL"
+    assert normalize_symbol("$brk.b") == "BRK-B"
+
+
+def test_index_loads_seed_universe():
+    index = get_index()
+    assert "AAPL" in index
+    assert index.resolve("FB") == "META"
+
+
+def test_screen_corrects_and_rejects():
+    screening = screen_tickers(
+        ["fb", "META", "LEH", "TWTR", "NOT A TICKER"],
+        [date(2010, 3, 1), date(2012, 6, 1)],
+    )
+    assert screening.kept == []  # META only listed 2012-05-18
+    assert screening.corrected["fb"] == "META"
+    assert screening.rejected["LEH"].startswith("not listed")
+    assert screening.rejected["TWTR"] == "not listed on 2010-03-01"
+    assert screening.rejected["NOT A TICKER"] == "malformed symbol"
+
+
+def test_screen_keeps_unknown_symbols_unless_strict(settings):
+    assert screen_tickers(["ZZZZ"], [date(2020, 1, 2)]).kept == ["ZZZZ"]
+    settings.TICKER_INDEX_STRICT = True
+    assert screen_tickers(["ZZZZ"], [date(2020, 1, 2)]).kept == []
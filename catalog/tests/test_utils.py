@@ -1,9 +1,12 @@
 import os
+from datetime import date
+from types import SimpleNamespace
 
 import pytest
 
-from catalog.schemas import DatesResponse
-from catalog.utils import generate_dates
+from catalog import utils
+from catalog.schemas import DatesResponse, StockResponse
+from catalog.utils import generate_dates, generate_study
 
 
 @pytest.mark.skipif(not os.getenv("OPENAI_API_KEY"), reason="No OPENAI_API_KEY in .env")
@@ -13,3 +16,66 @@ def test_generate_dates_smoke():
     assert isinstance(resp, DatesResponse)
     assert len(resp.events) == 1
     assert hasattr(resp.events[0], "year")
+
+
+def _reply(monkeypatch, text):
+    calls = []
+
+    def fake_chat(prompt, json_mode=False):
+        calls.append(json_mode)
+        return text
+
+    monkeypatch.setattr(utils, "_chat", fake_chat)
+    return calls
+
+
+def test_generate_study_parses_one_structured_reply(monkeypatch):
+    calls = _reply(
+        monkeypatch,
+        '{"confirmed": true, "events": [{"date": "2016-06-23", '
+        '"description": "UK votes to leave the EU."}], '
+        '"stocks": {"positive": ["GLD", "TLT"], "negative": ["EWU"]}, '
+        '"message": "ok"}',
+    )
+    resp = generate_study("Brexit vote", limit=1)
+    assert calls == [True]
+    assert resp.events[0].date == date(2016, 6, 23)
+    assert resp.events[0].description == "UK votes to leave the EU."
+    assert resp.stocks.positive == ["GLD"]
+    assert resp.stocks.negative == ["EWU"]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Sorry, I can't help with that.",
+        '{"confirmed": true, "events": ["2016-06-23"], "stocks": {}}',
+        '{"confirmed": false, "events": [], "stocks": {}}',
+    ],
+)
+def test_generate_study_returns_none_so_callers_fall_back(monkeypatch, text):
+    _reply(monkeypatch, text)
+    assert generate_study("Brexit vote") is None
+
+
+@pytest.mark.parametrize(
+    "stored, expected",
+    [
+        ({"positive": ["XOM"], "negative": []}, ["XOM"]),
+        ({"positive": [], "negative": []}, ["FRESH"]),
+        (None, ["FRESH"]),
+    ],
+)
+def test_step_two_falls_back_when_one_shot_picked_no_tickers(
+    monkeypatch, settings, stored, expected
+):
+    from catalog import views
+
+    settings.PREFETCH_WAIT = 0
+    fresh = StockResponse(stocks={"positive": ["FRESH"], "negative": []}, message="")
+    monkeypatch.setattr(views, "speculative_stocks", lambda post_id, wait: None)
+    monkeypatch.setattr(views, "generate_stocks", lambda topic, limit: fresh)
+    request = SimpleNamespace(
+        session={"stock_suggestions": stored, "post_id": 1, "title": "Oil"}
+    )
+    assert views._suggest_stocks(request).stocks.positive == expected
@@ -0,0 +1,99 @@
+import importlib
+
+import pytest
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from catalog.models import AnalysisPost, Vote
+from catalog.ranking import hot_score
+from catalog.votes import cast_vote
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def post():
+    author = User.objects.create_user("author")
+    return AnalysisPost.objects.create(author=author, title="Study", prompt_text="x")
+
+
+@pytest.fixture
+def voter():
+    return User.objects.create_user("voter")
+
+
+def _tally(post):
+    post.refresh_from_db()
+    return post.upvotes, post.downvotes
+
+
+def test_new_vote_counts_once(post, voter):
+    assert cast_vote(post.pk, voter, Vote.UPVOTE)
+    assert _tally(post) == (1, 0)
+    assert post.hot_score == pytest.approx(hot_score(1, 0, post.created_at))
+
+
+def test_repeated_vote_is_a_no_op(post, voter):
+    cast_vote(post.pk, voter, Vote.UPVOTE)
+    assert not cast_vote(post.pk, voter, Vote.UPVOTE)
+    assert _tally(post) == (1, 0)
+    assert Vote.objects.filter(post=post).count() == 1
+
+
+def test_flipped_vote_moves_the_count(post, voter):
+    cast_vote(post.pk, voter, Vote.UPVOTE)
+    assert cast_vote(post.pk, voter, Vote.DOWNVOTE)
+    assert _tally(post) == (0, 1)
+    assert post.hot_score == pytest.approx(hot_score(0, 1, post.created_at))
+    # Upserted in place, not a second row
+    assert list(Vote.objects.filter(post=post).values_list("value", flat=True)) == [
+        Vote.DOWNVOTE
+    ]
+
+
+def test_votes_from_several_users_add_up(post, voter):
+    other = User.objects.create_user("other")
+    cast_vote(post.pk, voter, Vote.UPVOTE)
+    cast_vote(post.pk, other, Vote.UPVOTE)
+    cast_vote(post.pk, post.author, Vote.DOWNVOTE)
+    assert _tally(post) == (2, 1)
+
+
+def test_vote_on_a_missing_post_raises(voter):
+    with pytest.raises(AnalysisPost.DoesNotExist):
+        cast_vote(10**6, voter, Vote.UPVOTE)
+
+
+def test_backfill_counts_existing_votes(post, voter):
+    other = User.objects.create_user("other")
+    Vote.objects.create(post=post, user=voter, value=Vote.UPVOTE)
+    Vote.objects.create(post=post, user=other, value=Vote.DOWNVOTE)
+    Vote.objects.create(post=post, user=post.author, value=Vote.UPVOTE)
+    migration = importlib.import_module(
+        "catalog.migrations.0006_analysispost_vote_counters"
+    )
+    migration.backfill_vote_counters(apps, None)
+    assert _tally(post) == (2, 1)
+
+
+def test_vote_view(post, voter, client):
+    client.force_login(voter)
+    url = reverse("catalog:vote", args=[post.pk, "down"])
+    resp = client.post(url)
+    assert resp.status_code == 302
+    assert resp.url == reverse("catalog:analysis_detail", args=[post.pk])
+    assert _tally(post) == (0, 1)
+
+    assert client.get(url).status_code == 405
+    assert (
+        client.post(reverse("catalog:vote", args=[post.pk, "sideways"])).status_code
+        == 404
+    )
+    assert client.post(reverse("catalog:vote", args=[10**6, "up"])).status_code == 404
+
+
+def test_vote_view_requires_login(post, client):
+    resp = client.post(reverse("catalog:vote", args=[post.pk, "up"]))
+    assert resp.status_code == 302
+    assert _tally(post) == (0, 0)
@@ -0,0 +1,179 @@
+"""
+catalog/tickers.py
+In-memory index of the ticker universe, used to screen LLM suggestions
+before any price or metadata request goes over the network.
+
+The universe lives in ``catalog/data/tickers.csv`` (override with the
+``TICKER_INDEX_PATH`` setting) and is loaded once per process. Columns:
+
+    symbol, name, exchange, listed, delisted, tier, former
+
+``listed``/``delisted`` are ISO dates (blank = unknown / still trading),
+``tier`` is a liquidity tier (1 = most liquid) and ``former`` holds
+``;``-separated symbols the listing used to trade under. Refresh the file
+with ``manage.py build_ticker_index``.
+
+Functions
+---------
+get_index() -> TickerIndex
+screen_tickers(symbols, dates, max_tier=None) -> Screening
+"""
+
+from __future__ import annotations
+
+import csv
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+from django.conf import settings
+
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parent / "data" / "tickers.csv"
+
+CSV_COLUMNS = ["symbol", "name", "exchange", "listed", "delisted", "tier", "former"]
+
+# Plain US symbols, optionally with a share-class suffix (BRK-B)
+_SYMBOL_RE = re.compile(r"^[A-Z]{1,5}(?:-[A-Z]{1,2})?$")
+# "NASDAQ:AAPL", "$AAPL", "aapl " …
+_PREFIX_RE = re.compile(r"^(?:[A-Z]+:|\$)")
+
+
+@dataclass(frozen=True, slots=True)
+class Listing:
+    symbol: str
+    name: str
+    exchange: str
+    listed: date | None
+    delisted: date | None
+    tier: int
+    former: tuple[str, ...] = ()
+
+    def trades_on(self, d: date) -> bool:
+        """True if the symbol was listed on *d* (unknown bounds pass)."""
+        if self.listed is not None and d < self.listed:
+            return False
+        if self.delisted is not None and d > self.delisted:
+            return False
+        return True
+
+
+@dataclass
+class Screening:
+    """Outcome of :func:`screen_tickers`."""
+
+    kept: list[str] = field(default_factory=list)
+    corrected: dict[str, str] = field(default_factory=dict)  # raw -> symbol
+    rejected: dict[str, str] = field(default_factory=dict)  # raw -> reason
+
+
+def normalize_symbol(raw: str) -> str:
+    """Upper-case *raw*, drop exchange/cashtag prefixes and use Yahoo's
+    ``-`` share-class separator (``brk.b`` → ``BRK-B``)."""
+    sym = raw.strip().upper()
+    sym = _PREFIX_RE.sub("", sym)
+    return sym.replace(".", "-").replace("/", "-")
+
+
+class TickerIndex:
+    """Symbol → :class:`Listing` lookup with former-symbol aliases."""
+
+    def __init__(self, listings: Iterable[Listing]):
+        self._by_symbol: dict[str, Listing] = {}
+        self._aliases: dict[str, str] = {}
+        for listing in listings:
+            self._by_symbol[listing.symbol] = listing
+            for old in listing.former:
+                self._aliases[normalize_symbol(old)] = listing.symbol
+
+    def __len__(self) -> int:
+        return len(self._by_symbol)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._by_symbol
+
+    def get(self, symbol: str) -> Listing | None:
+        return self._by_symbol.get(symbol)
+
+    def resolve(self, raw: str) -> str:
+        """Map *raw* to the current symbol, following former tickers."""
+        sym = normalize_symbol(raw)
+        if sym in self._by_symbol:
+            return sym
+        return self._aliases.get(sym, sym)
+
+    @classmethod
+    def from_csv(cls, path: Path) -> "TickerIndex":
+        with open(path, newline="", encoding="utf-8") as fh:
+            return cls(_parse_row(row) for row in csv.DictReader(fh))
+
+
+def _parse_date(value: str) -> date | None:
+    return date.fromisoformat(value) if value else None
+
+
+def _parse_row(row: dict) -> Listing:
+    return Listing(
+        symbol=row["symbol"],
+        name=row["name"],
+        exchange=row["exchange"],
+        listed=_parse_date(row["listed"]),
+        delisted=_parse_date(row["delisted"]),
+        tier=int(row["tier"] or 3),
+        former=tuple(s for s in row["former"].split(";") if s),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_index() -> TickerIndex:
+    """The process-wide index, read from disk on first use."""
+    path = getattr(settings, "TICKER_INDEX_PATH", None) or DEFAULT_INDEX_PATH
+    return TickerIndex.from_csv(Path(path))
+
+
+def screen_tickers(
+    symbols: Iterable[str],
+    dates: Iterable[date],
+    max_tier: int | None = None,
+) -> Screening:
+    """
+    Normalise and de-duplicate *symbols*, then drop the ones that cannot
+    produce price data for every date in *dates*.
+
+    Symbols missing from the index are kept unless the ``TICKER_INDEX_STRICT``
+    setting is on; malformed symbols are always rejected.
+    """
+    index = get_index()
+    strict = getattr(settings, "TICKER_INDEX_STRICT", False)
+    dates = list(dates)
+    result = Screening()
+
+    for raw in symbols:
+        sym = index.resolve(raw)
+        if sym != raw:
+            result.corrected[raw] = sym
+        if sym in result.kept:
+            continue
+        if not _SYMBOL_RE.match(sym):
+            result.rejected[raw] = "malformed symbol"
+            continue
+
+        listing = index.get(sym)
+        if listing is None:
+            if strict:
+                result.rejected[raw] = "not in ticker index"
+            else:
+                result.kept.append(sym)
+            continue
+        if max_tier is not None and listing.tier > max_tier:
+            result.rejected[raw] = f"liquidity tier {listing.tier}"
+            continue
+        missing = [d for d in dates if not listing.trades_on(d)]
+        if missing:
+            result.rejected[raw] = f"not listed on {missing[0].isoformat()}"
+            continue
+        result.kept.append(sym)
+
+    return result
@@ -9,6 +9,18 @@ urlpatterns = [
     path("", views.home, name="home"),  # /
     path("chat/", views.chat_flow, name="chat_flow"),  # /chat/
     path("analysis/", views.analysis_list, name="analysis_list"),
+    path("analysis/search/", views.analysis_search, name="analysis_search"),
+    path("analysis/top/", views.analysis_top, name="analysis_top"),
     path("analysis/<int:pk>/", views.analysis_detail, name="analysis_detail"),
+    path("analysis/<int:pk>/extend/", views.analysis_extend, name="analysis_extend"),
+    path("analysis/<int:pk>/data/", views.analysis_data, name="analysis_data"),
+    path(
+        "analysis/<int:pk>/export.<str:fmt>",
+        views.analysis_export,
+        name="analysis_export",
+    ),
+    path("analysis/export.<str:fmt>", views.analysis_export_bulk, name="export"),
+    path("assets/plotly-<str:version>.min.js", views.plotly_js, name="plotly_js"),
+    path("metrics/connections/", views.connection_stats, name="connection_stats"),
     path("analysis/<int:pk>/vote/<str:action>/", views.vote, name="vote"),
 ]
@@ -6,6 +6,8 @@ Functions
 ---------
 generate_dates(query: str)  -> DatesResponse
 generate_stocks(topic: str) -> StockResponse
+summarize_event(topic: str, iso: str) -> str
+generate_study(query: str, limit=None) -> OneShotResponse | None
 """
 
 from __future__ import annotations
@@ -13,15 +15,15 @@ from __future__ import annotations
 import json
 import re
 
-from openai import OpenAI
 from pydantic import ValidationError
 
-from catalog.schemas import DatesResponse, StockResponse
+from catalog.clients import llm
+from catalog.scheduler import get_scheduler
+from catalog.schemas import DatesResponse, OneShotResponse, StockResponse
 
 # ---------- OpenAI client ----------------------------------------------------
 
 _MODEL = "gpt-4o-mini"
-_client = OpenAI()
 
 # ---------- helpers ----------------------------------------------------------
 
@@ -34,14 +36,20 @@ def _strip_fence(text: str) -> str:
     return match.group(1) if match else text.strip()
 
 
-def _chat(prompt: str) -> str:
+def _chat(prompt: str, json_mode: bool = False) -> str:
     """
-    Minimal wrapper around the chat-completion call.
+    Minimal wrapper around the chat-completion call, rate limited and
+    retried by the shared scheduler. *json_mode* asks the API to return a
+    single JSON object.
     Returns the assistant’s raw content string.
     """
-    resp = _client.chat.completions.create(
+    extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+    resp = get_scheduler().call(
+        "llm",
+        llm().chat.completions.create,
         model=_MODEL,
         messages=[{"role": "user", "content": prompt}],
+        **extra,
     )
     return resp.choices[0].message.content
 
@@ -119,3 +127,52 @@ def generate_stocks(topic: str, limit: int | None = None) -> StockResponse:
         resp.stocks.negative = resp.stocks.negative[:limit]
 
     return resp
+
+
+def summarize_event(topic: str, iso: str) -> str:
+    """Short LLM account of what happened on *iso*, in the context of *topic*."""
+    prompt = (
+        f"I’m studying this event:\n"
+        f'  "{topic}"\n'
+        f"Key date: {iso}. What happened on that date?"
+    )
+    return _chat(prompt).strip()
+
+
+def generate_study(query: str, limit: int | None = None) -> OneShotResponse | None:
+    """
+    Dates, a description of each date and positive/negative tickers for
+    *query* in one structured call — what ``generate_dates``,
+    ``summarize_event`` per date and ``generate_stocks`` return between
+    them. Returns None when the reply does not validate or finds no dates,
+    so callers can fall back to the separate calls.
+    """
+    prompt = (
+        f"I want to analyse the event or topic: '{query}'.\n"
+        "1. List up to 8 significant dates (ISO-8601 YYYY-MM-DD), "
+        "earliest→latest, each with one or two sentences on what happened.\n"
+        f"2. Suggest up to {limit or 6} liquid US-listed tickers per side that "
+        "historically react to this news: 'positive' likely to go up, "
+        "'negative' likely to go down or hedge.\n"
+        "Reply with a JSON object exactly like:\n"
+        "{\n"
+        '  "confirmed": true,\n'
+        '  "events": [{"date": "2025-01-01", "description": "..."}],\n'
+        '  "stocks": {"positive": ["TICK1"], "negative": ["TICK2"]},\n'
+        '  "message": "brief summary"\n'
+        "}\n"
+        'Use "confirmed": false and empty lists if no dates are known.'
+    )
+
+    try:
+        data = json.loads(_strip_fence(_chat(prompt, json_mode=True)))
+        resp = OneShotResponse.model_validate(data)
+    except (json.JSONDecodeError, ValidationError):
+        return None
+    if not resp.confirmed or not resp.events:
+        return None
+
+    if limit is not None:
+        resp.stocks.positive = resp.stocks.positive[:limit]
+        resp.stocks.negative = resp.stocks.negative[:limit]
+    return resp
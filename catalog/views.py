@@ -1,19 +1,172 @@
-from datetime import date
+import gzip
+import importlib.metadata
+from contextlib import contextmanager
+from datetime import date, time
+from functools import lru_cache
 
-import pandas as pd
-import plotly.express as px
-import yfinance as yf
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.db.models import OuterRef, Q, Subquery
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from openai import OpenAI
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_POST
 
+from catalog.clients import pool_stats
+from catalog.export import FORMATS, ExportUnavailable, stream_export
+from catalog.extend import extend_analysis, study_axes
 from catalog.models import AnalysisPost, Vote
-from catalog.schemas import TopicRequest
-from catalog.utils import generate_dates, generate_stocks
+from catalog.prefetch import speculate, speculative_stocks
+from catalog.prices import ticker_info
+from catalog.results import aggregate, matrix_from_aggregates, mean_matrix
+from catalog.returns import daily_event_returns
+from catalog.scheduler import UpstreamUnavailable, budget
+from catalog.schemas import StockResponse, TopicRequest
+from catalog.search import search_posts
+from catalog.similarity import reusable_topic
+from catalog.tickers import get_index, screen_tickers
+from catalog.utils import (
+    generate_dates,
+    generate_stocks,
+    generate_study,
+    summarize_event,
+)
+from catalog.votes import cast_vote
 
 URL_NAME = "catalog:chat_flow"
-_llm = OpenAI()
+SIMILAR_LIMIT = 5
+WIZARD_KEYS = (
+    "step",
+    "post_id",
+    "title",
+    "events_info",
+    "events",
+    "stocks_info",
+    "budget_spent",
+    "mode",
+    "event_times",
+    "stock_suggestions",
+)
+
+
+@contextmanager
+def _analysis_budget(request):
+    """Upstream time budget shared by every step of one wizard run."""
+    spent = request.session.get("budget_spent", 0.0)
+    with budget(settings.ANALYSIS_TIME_BUDGET - spent) as b:
+        try:
+            yield b
+        finally:
+            request.session["budget_spent"] = spent + b.elapsed()
+
+
+def _confirm_dates(request, events):
+    return render(
+        request,
+        "catalog/confirm_dates.html",
+        {"events": events, "intraday": request.session.get("mode") == "intraday"},
+    )
+
+
+def _event_time(raw: str) -> str:
+    """A posted event time as ``HH:MM`` ("" if blank); ValueError if invalid."""
+    raw = (raw or "").strip()
+    return time.fromisoformat(raw).strftime("%H:%M") if raw else ""
+
+
+def _compute_results(request, stocks):
+    """Run the daily or intraday study for the confirmed events."""
+    events = request.session.get("events", [])
+    if request.session.get("mode") == "intraday":
+        from catalog.intraday import event_timestamp, intraday_event_returns
+
+        times = request.session.get("event_times", {})
+        stamps = [event_timestamp(d, times.get(d)) for d in events]
+        return intraday_event_returns(stamps, stocks)
+    return daily_event_returns([date.fromisoformat(d) for d in events], stocks)
+
+
+def _describe_stocks(tickers, sentiments):
+    """``stocks_data`` entries for *tickers*, falling back to the index."""
+    index = get_index()
+    stocks_info = []
+    for t in tickers:
+        listing = index.get(t)
+        try:
+            info = ticker_info(t)
+        except UpstreamUnavailable:
+            info = {}
+        name = info.get("longName") or info.get("shortName")
+        name = name or (listing.name if listing else t)
+        desc = (info.get("longBusinessSummary") or "")[:200]
+        started = listing.listed.isoformat() if listing and listing.listed else "—"
+        stocks_info.append(
+            {
+                "ticker": t,
+                "name": name,
+                "description": desc,
+                "sentiment": sentiments[t],
+                "started": started,
+            }
+        )
+    return stocks_info
+
+
+def _reused_events(request, query):
+    """
+    Events of an earlier analysis whose topic is a near-duplicate of
+    *query*, or None. Saves the date-extraction and summary calls.
+    """
+    match = reusable_topic(query)
+    if match is None:
+        return None
+    source, score = match
+    messages.info(
+        request,
+        f"Dates reused from a similar analysis: “{source.title}” "
+        f"({score:.0%} match).",
+    )
+    return [
+        {"date": ev["date"], "description": ev.get("description", "")}
+        for ev in source.events_data
+    ]
+
+
+def _one_shot_events(request, query):
+    """
+    Events from a single structured LLM call, keeping its ticker picks for
+    step 2; None (fall back to the separate calls) if the reply is unusable.
+    """
+    try:
+        study = generate_study(query, limit=5)
+    except UpstreamUnavailable:
+        return None
+    if study is None:
+        return None
+    request.session["stock_suggestions"] = study.stocks.model_dump()
+    return [
+        {"date": ev.date.isoformat(), "description": ev.description}
+        for ev in study.events
+    ]
+
+
+def _suggest_stocks(request):
+    """
+    Tickers picked alongside the dates in step 1 or by the speculative
+    prefetch, else a fresh LLM call.
+    """
+    suggestions = request.session.get("stock_suggestions") or {}
+    if suggestions.get("positive") or suggestions.get("negative"):
+        return StockResponse(stocks=suggestions, message="")
+    speculated = speculative_stocks(
+        request.session["post_id"], wait=settings.PREFETCH_WAIT
+    )
+    return speculated or generate_stocks(request.session["title"], limit=5)
 
 
 def home(request):
@@ -24,7 +177,7 @@ def home(request):
 def chat_flow(request):
     # Reset wizard state on any GET
     if request.method == "GET":
-        for key in ("step", "post_id", "title", "events_info", "events", "stocks_info"):
+        for key in WIZARD_KEYS:
             request.session.pop(key, None)
 
     step = request.session.get("step", 1)
@@ -36,51 +189,89 @@ def chat_flow(request):
             if not user_query:
                 return render(request, "catalog/topic_form.html")
 
-            tr = TopicRequest(query=user_query)
-            dates_resp = generate_dates(tr.query)
-            if not dates_resp.confirmed or not dates_resp.events:
-                messages.error(
-                    request, "Couldn't find any dates. Try another description."
+            # Offer existing studies on the topic before spending LLM calls;
+            # "Run a new analysis anyway" (force) skips that and any reuse
+            force = bool(request.POST.get("force"))
+            if not force:
+                similar = list(
+                    search_posts(user_query)
+                    .exclude(results_data={})
+                    .only("title", "created_at", "upvotes", "downvotes")[:SIMILAR_LIMIT]
                 )
-                return redirect(URL_NAME)
+                if similar:
+                    return render(
+                        request,
+                        "catalog/topic_form.html",
+                        {
+                            "similar": similar,
+                            "query": user_query,
+                            "intraday": bool(request.POST.get("intraday")),
+                        },
+                    )
 
-            # Create AnalysisPost and store id
-            post = AnalysisPost.objects.create(
-                author=request.user,
-                title=user_query,
-                prompt_text=user_query,
-            )
-            request.session["post_id"] = post.pk
-            request.session["title"] = user_query
-
-            # Summarize each date
-            events_info = []
-            for d in dates_resp.events:
-                iso = d.isoformat()
-                prompt = (
-                    f"I’m studying this event:\n"
-                    f'  "{user_query}"\n'
-                    f"Key date: {iso}. What happened on that date?"
+            tr = TopicRequest(query=user_query)
+            events_info = None if force else _reused_events(request, tr.query)
+            with _analysis_budget(request):
+                if events_info is None and settings.LLM_ONE_SHOT:
+                    events_info = _one_shot_events(request, tr.query)
+                if events_info is None:
+                    try:
+                        dates_resp = generate_dates(tr.query)
+                    except UpstreamUnavailable:
+                        messages.error(
+                            request, "The language model is busy. Try again shortly."
+                        )
+                        return redirect(URL_NAME)
+                    if not dates_resp.confirmed or not dates_resp.events:
+                        messages.error(
+                            request,
+                            "Couldn't find any dates. Try another description.",
+                        )
+                        return redirect(URL_NAME)
+
+                # Create AnalysisPost and store id
+                mode = (
+                    AnalysisPost.INTRADAY
+                    if request.POST.get("intraday")
+                    else AnalysisPost.DAILY
                 )
-                try:
-                    resp = _llm.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[{"role": "user", "content": prompt}],
-                    )
-                    summary = resp.choices[0].message.content.strip()
-                except Exception:
-                    summary = ""
-                events_info.append({"date": iso, "description": summary})
+                post = AnalysisPost.objects.create(
+                    author=request.user,
+                    title=user_query,
+                    prompt_text=user_query,
+                    mode=mode,
+                )
+                request.session["post_id"] = post.pk
+                request.session["title"] = user_query
+                request.session["mode"] = mode
+
+                # Summarize each date; a failed summary only loses its text
+                if events_info is None:
+                    events_info = []
+                    for d in dates_resp.events:
+                        iso = d.isoformat()
+                        try:
+                            summary = summarize_event(user_query, iso)
+                        except UpstreamUnavailable:
+                            summary = ""
+                        events_info.append({"date": iso, "description": summary})
 
             # Persist events_data
             post.events_data = events_info
             post.save(update_fields=["events_data"])
 
+            # Fetch step 2's suggestions and warm prices while the user reads
+            speculate(
+                post.pk,
+                user_query,
+                [ev["date"] for ev in events_info],
+                post.mode,
+                request.session.get("stock_suggestions"),
+            )
+
             request.session["events_info"] = events_info
             request.session["step"] = 2
-            return render(
-                request, "catalog/confirm_dates.html", {"events": events_info}
-            )
+            return _confirm_dates(request, events_info)
         return render(request, "catalog/topic_form.html")
 
     # Step 2: Date confirmation & stock suggestion
@@ -88,32 +279,52 @@ def chat_flow(request):
         selected = request.POST.getlist("events")
         if not selected:
             messages.error(request, "Select at least one date to proceed.")
-            return render(
-                request,
-                "catalog/confirm_dates.html",
-                {"events": request.session.get("events_info", [])},
-            )
+            return _confirm_dates(request, request.session.get("events_info", []))
+        times = {}
+        if request.session.get("mode") == "intraday":
+            for d in selected:
+                raw = request.POST.get(f"time_{d}", "")
+                try:
+                    times[d] = _event_time(raw)
+                except ValueError:
+                    messages.error(request, f"Not a time (HH:MM) for {d}: {raw}")
+                    return _confirm_dates(
+                        request, request.session.get("events_info", [])
+                    )
 
+        with _analysis_budget(request):
+            try:
+                stock_resp = _suggest_stocks(request)
+            except UpstreamUnavailable:
+                messages.error(request, "The language model is busy. Try again.")
+                return _confirm_dates(request, request.session.get("events_info", []))
         request.session["events"] = selected
         request.session["step"] = 3
-
-        stock_resp = generate_stocks(request.session["title"], limit=5)
-        pos, neg = stock_resp.stocks.positive, stock_resp.stocks.negative
-        stocks_info = []
-        for t in pos + neg:
-            tk = yf.Ticker(t)
-            info = getattr(tk, "info", {}) or {}
-            name = info.get("longName") or info.get("shortName") or t
-            desc = info.get("longBusinessSummary", "")[:200]
-            sentiment = "positive" if t in pos else "negative"
-            stocks_info.append(
-                {"ticker": t, "name": name, "description": desc, "sentiment": sentiment}
+        if request.session.get("mode") == "intraday":
+            request.session["event_times"] = times
+
+        # Drop invented/unlisted symbols before any network round trip
+        event_dates = [date.fromisoformat(d) for d in selected]
+        pos = screen_tickers(stock_resp.stocks.positive, event_dates).kept
+        neg = [
+            t
+            for t in screen_tickers(stock_resp.stocks.negative, event_dates).kept
+            if t not in pos
+        ]
+        with _analysis_budget(request):
+            stocks_info = _describe_stocks(
+                pos + neg,
+                {t: "positive" if t in pos else "negative" for t in pos + neg},
             )
 
-        # Persist stocks_data
+        # Persist stocks_data (and event times for intraday studies)
         post = AnalysisPost.objects.get(pk=request.session["post_id"])
         post.stocks_data = stocks_info
-        post.save(update_fields=["stocks_data"])
+        times = request.session.get("event_times", {})
+        for ev in post.events_data:
+            if times.get(ev["date"]):
+                ev["time"] = times[ev["date"]]
+        post.save(update_fields=["stocks_data", "events_data"])
 
         request.session["stocks_info"] = stocks_info
         return render(
@@ -125,29 +336,17 @@ def chat_flow(request):
         stocks = request.POST.getlist("stocks") or [
             s["ticker"] for s in request.session.get("stocks_info", [])
         ]
-        dates = [date.fromisoformat(d) for d in request.session.get("events", [])]
-
-        df = pd.DataFrame(
-            [(d, t) for d in dates for t in stocks], columns=["date", "ticker"]
-        )
-        df["date"] = pd.to_datetime(df["date"])
-
-        start = df["date"].min() - pd.Timedelta(days=10)
-        end = df["date"].max() + pd.Timedelta(days=60)
-        price_dict = {
-            t: yf.Ticker(t)
-            .history(start=start, end=end, auto_adjust=True)["Close"]
-            .tz_localize(None)
-            for t in set(df["ticker"])
-        }
-        prices_df = pd.DataFrame(price_dict).sort_index()
-
-        idx = prices_df.index.get_indexer(df["date"], method="ffill")
-        df["price"] = [
-            prices_df[t].iloc[i] if i >= 0 else pd.NA for t, i in zip(df["ticker"], idx)
-        ]
-        df = df.dropna(subset=["price"])
-        if df.empty:
+        try:
+            with _analysis_budget(request):
+                analysis_data = _compute_results(request, stocks)
+        except UpstreamUnavailable:
+            messages.error(request, "Price service unavailable—try again shortly.")
+            return render(
+                request,
+                "catalog/choose_stocks.html",
+                {"stocks_info": request.session.get("stocks_info", [])},
+            )
+        if not analysis_data:
             messages.error(request, "No price data—adjust selections.")
             return render(
                 request,
@@ -155,33 +354,13 @@ def chat_flow(request):
                 {"stocks_info": request.session.get("stocks_info", [])},
             )
 
-        horizons = {"1D": 1, "1W": 5, "2W": 10, "1M": 20, "2M": 40}
-        idx = prices_df.index.get_indexer(df["date"], method="ffill")
-        for tkr in prices_df.columns:
-            series = prices_df[tkr]
-            for label, days in horizons.items():
-                col = f"{tkr}_cumret_{label}"
-                df[col] = [
-                    (series.iloc[i + days] / series.iloc[i] - 1)
-                    if i + days < len(series)
-                    else pd.NA
-                    for i in idx
-                ]
-
-        analysis_data = {}
-        for _, row in df.iterrows():
-            iso = row["date"].date().isoformat()
-            tkr = row["ticker"]
-            analysis_data.setdefault(iso, {}).setdefault(tkr, {})
-            for label in horizons:
-                analysis_data[iso][tkr][label] = row.get(f"{tkr}_cumret_{label}")
-
         post = AnalysisPost.objects.get(pk=request.session["post_id"])
         post.results_data = analysis_data
-        post.save(update_fields=["results_data"])
+        post.aggregates = aggregate(analysis_data)
+        post.save(update_fields=["results_data", "aggregates", "updated_at"])
 
         # Clear state and redirect
-        for k in ("step", "post_id", "title", "events_info", "events", "stocks_info"):
+        for k in WIZARD_KEYS:
             request.session.pop(k, None)
         return redirect("catalog:analysis_detail", pk=post.pk)
 
@@ -197,66 +376,290 @@ def chat_flow(request):
     return redirect(URL_NAME)
 
 
+def _parse_cursor(raw):
+    """``"<score>_<pk>"`` → (score, pk), or None."""
+    try:
+        score, pk = raw.rsplit("_", 1)
+        return float(score), int(pk)
+    except ValueError:
+        return None
+
+
+def analysis_top(request):
+    """
+    Top analyses by hot score, ``n`` at a time, paginated by keyset on the
+    (hot_score, id) index. Anonymous pages are shared through the cache.
+    """
+    try:
+        n = min(max(int(request.GET.get("n", 20)), 1), 100)
+    except ValueError:
+        n = 20
+    cursor = _parse_cursor(request.GET.get("after", ""))
+    anonymous = not request.user.is_authenticated
+    ttl = settings.TOP_FEED_CACHE_SECONDS
+    key = f"feed:top:{n}:" + (f"{cursor[0]!r}_{cursor[1]}" if cursor else "start")
+
+    if anonymous:
+        cached = cache.get(key)
+        if cached is not None:
+            response = HttpResponse(cached)
+            patch_cache_control(response, public=True, max_age=ttl)
+            return response
+
+    posts = AnalysisPost.objects.only(
+        "title", "created_at", "upvotes", "downvotes", "hot_score"
+    ).order_by("-hot_score", "-id")
+    if cursor:
+        score, pk = cursor
+        posts = posts.filter(Q(hot_score__lt=score) | Q(hot_score=score, pk__lt=pk))
+    page = list(posts[: n + 1])
+    next_cursor = None
+    if len(page) > n:
+        page = page[:n]
+        next_cursor = f"{page[-1].hot_score!r}_{page[-1].pk}"
+
+    response = render(
+        request,
+        "catalog/analysis_top.html",
+        {"posts": page, "n": n, "next_cursor": next_cursor},
+    )
+    if anonymous:
+        cache.set(key, response.content, ttl)
+        patch_cache_control(response, public=True, max_age=ttl)
+    return response
+
+
+@login_required
+def analysis_search(request):
+    """Analyses matching ``q`` by topic, event descriptions or ticker."""
+    query = request.GET.get("q", "").strip()
+    posts = search_posts(query).only(
+        "title", "created_at", "upvotes", "downvotes", "hot_score"
+    )[:50]
+    return render(
+        request, "catalog/analysis_search.html", {"query": query, "posts": posts}
+    )
+
+
 @login_required
 def analysis_list(request):
     posts = AnalysisPost.objects.all().order_by("-created_at")
     return render(request, "catalog/analysis_list.html", {"posts": posts})
 
 
+def _post_matrix(post):
+    """Mean matrix from the stored aggregates (older posts: from results)."""
+    if post.aggregates:
+        return matrix_from_aggregates(post.aggregates)
+    return mean_matrix(post.results_data or {})
+
+
 @login_required
 def analysis_detail(request, pk):
-    post = get_object_or_404(AnalysisPost, pk=pk)
-    plot_div = None
-    table_html = None
+    # Tallies are columns on the post; the viewer's own vote rides along as
+    # a subquery, so the page costs a single query.
+    own_vote = Vote.objects.filter(post=OuterRef("pk"), user=request.user)
+    post = get_object_or_404(
+        AnalysisPost.objects.annotate(user_vote=Subquery(own_vote.values("value")[:1])),
+        pk=pk,
+    )
+    table = None
 
     if post.results_data:
-        results = post.results_data
-        horizon_set = set()
-        tickers = set()
-        for date_str, tmap in results.items():
-            for tkr, hmap in tmap.items():
-                tickers.add(tkr)
-                horizon_set.update(hmap.keys())
-        ordered_horizons = ["1D", "1W", "2W", "1M", "2M"]
-        horizons = [h for h in ordered_horizons if h in horizon_set]
-        tickers = sorted(tickers)
-
-        mean_data = {tkr: {} for tkr in tickers}
-        for tkr in tickers:
-            for h in horizons:
-                vals = [
-                    results[dt][tkr][h]
-                    for dt in results
-                    if tkr in results[dt] and results[dt][tkr].get(h) is not None
-                ]
-                mean_data[tkr][h] = sum(vals) / len(vals) if vals else None
-        df = pd.DataFrame.from_dict(mean_data, orient="index", columns=horizons)
-
-        fig = px.imshow(
-            df,
-            x=horizons,
-            y=tickers,
-            color_continuous_scale="RdYlGn",
-            labels={"x": "Horizon", "y": "Ticker", "color": "Mean Return"},
-            title="Mean Cumulative Return Heatmap",
-        )
-        fig.update_layout(xaxis_side="bottom", height=600)
-        plot_div = fig.to_html(full_html=False, include_plotlyjs="cdn")
-
-        table_html = df.to_html(
-            classes="table table-striped", float_format="%.4f", na_rep="—"
-        )
+        matrix = _post_matrix(post)
+        table = {
+            "horizons": matrix["horizons"],
+            "rows": list(zip(matrix["tickers"], matrix["z"])),
+        }
 
     return render(
         request,
         "catalog/analysis_detail.html",
-        {"post": post, "plot_div": plot_div, "table_html": table_html},
+        {
+            "post": post,
+            "table": table,
+            "plotly_version": _plotly_version(),
+            "upvotes": post.upvotes,
+            "downvotes": post.downvotes,
+            "user_vote": post.user_vote,
+        },
     )
 
 
-def vote(request, pk, action):
+@login_required
+def analysis_extend(request, pk):
+    """Add event dates and/or tickers to an analysis, computing only new cells."""
     post = get_object_or_404(AnalysisPost, pk=pk)
+    if post.author_id != request.user.pk:
+        raise PermissionDenied
+    dates, tickers = study_axes(post)
+    context = {"post": post, "dates": dates, "tickers": tickers}
+    if request.method != "POST":
+        return render(request, "catalog/analysis_extend.html", context)
+
+    new_dates, times = [], {}
+    for line in request.POST.get("dates", "").splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        try:
+            iso = date.fromisoformat(parts[0]).isoformat()
+        except ValueError:
+            messages.error(request, f"Not a date: {parts[0]}")
+            return render(request, "catalog/analysis_extend.html", context)
+        new_dates.append(iso)
+        if len(parts) > 1:
+            try:
+                times[iso] = _event_time(parts[1])
+            except ValueError:
+                messages.error(request, f"Not a time (HH:MM): {parts[1]}")
+                return render(request, "catalog/analysis_extend.html", context)
+    new_dates = [d for d in dict.fromkeys(new_dates) if d not in dates]
+
+    raw = request.POST.get("tickers", "").replace(",", " ").split()
+    all_dates = [date.fromisoformat(d) for d in dates + new_dates]
+    screening = screen_tickers(raw, all_dates)
+    new_tickers = [t for t in screening.kept if t not in tickers]
+    for symbol, reason in screening.rejected.items():
+        messages.warning(request, f"Skipped {symbol}: {reason}")
+
+    if not new_dates and not new_tickers:
+        messages.error(request, "Nothing new to add.")
+        return render(request, "catalog/analysis_extend.html", context)
+
+    try:
+        with budget(settings.ANALYSIS_TIME_BUDGET):
+            added = extend_analysis(post, new_dates, new_tickers, times)
+            for iso in new_dates:
+                try:
+                    summary = summarize_event(post.prompt_text, iso)
+                except UpstreamUnavailable:
+                    summary = ""
+                event = {"date": iso, "description": summary}
+                if times.get(iso):
+                    event["time"] = times[iso]
+                post.events_data.append(event)
+            post.stocks_data += _describe_stocks(
+                new_tickers, dict.fromkeys(new_tickers, "added")
+            )
+    except UpstreamUnavailable:
+        messages.error(request, "Price service unavailable—try again shortly.")
+        return render(request, "catalog/analysis_extend.html", context)
+    post.save(update_fields=["events_data", "stocks_data"])
+
+    messages.success(request, f"Added {added} result cells.")
+    return redirect("catalog:analysis_detail", pk=post.pk)
+
+
+def _post_updated_at(request, pk):
+    return (
+        AnalysisPost.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+    )
+
+
+def _post_etag(request, pk):
+    updated_at = _post_updated_at(request, pk)
+    return f"{pk}-{updated_at.timestamp()}" if updated_at else None
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_post_etag, last_modified_func=_post_updated_at)
+def analysis_data(request, pk):
+    """Mean-return matrix for the heatmap; revalidated via ETag/Last-Modified."""
+    post = get_object_or_404(
+        AnalysisPost.objects.only("results_data", "aggregates"), pk=pk
+    )
+    return JsonResponse(_post_matrix(post))
+
+
+# ---------- Export -----------------------------------------------------------
+
+
+def _export_response(posts, fmt, filename):
+    if fmt not in FORMATS:
+        raise Http404("Unknown export format")
+    try:
+        chunks = stream_export(posts, fmt)
+    except ExportUnavailable as exc:
+        return HttpResponse(str(exc), status=501, content_type="text/plain")
+    content_type, ext = FORMATS[fmt]
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{ext}"'
+    return response
+
+
+@login_required
+def analysis_export(request, pk, fmt):
+    """One analysis's results as a CSV / Parquet / Arrow download."""
+    posts = AnalysisPost.objects.filter(pk=pk)
+    if not posts.exists():
+        raise Http404("No such analysis")
+    return _export_response(posts, fmt, f"analysis-{pk}")
+
+
+@login_required
+def analysis_export_bulk(request, fmt):
+    """Results of ``?ids=1,2,…`` (default: every analysis), streamed."""
+    posts = AnalysisPost.objects.exclude(results_data={})
+    raw = request.GET.get("ids", "")
+    if raw:
+        try:
+            ids = [int(i) for i in raw.split(",") if i.strip()]
+        except ValueError:
+            raise Http404("Bad analysis ids")
+        posts = posts.filter(pk__in=ids)
+    return _export_response(posts, fmt, "analyses")
+
+
+# ---------- Plotly bundle ----------------------------------------------------
+
+
+def _plotly_version():
+    return importlib.metadata.version("plotly")
+
+
+@lru_cache(maxsize=1)
+def _plotly_bundle():
+    """Read the plotly.js bundle shipped with the plotly package once."""
+    from plotly.offline import get_plotlyjs
+
+    raw = get_plotlyjs().encode("utf-8")
+    return raw, gzip.compress(raw)
+
+
+@cache_control(public=True, max_age=31536000, immutable=True)
+def plotly_js(request, version):
+    """
+    Serve plotly.js from memory. The URL carries the package version, so
+    browsers may cache it forever.
+    """
+    if version != _plotly_version():
+        raise Http404("Unknown plotly.js version")
+    raw, compressed = _plotly_bundle()
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        response = HttpResponse(compressed, content_type="text/javascript")
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(raw, content_type="text/javascript")
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+@staff_member_required
+def connection_stats(request):
+    """Usage counters for the upstream HTTP pools and the database."""
+    return JsonResponse(pool_stats())
+
+
+@login_required
+@require_POST
+def vote(request, pk, action):
+    if action not in ("up", "down"):
+        raise Http404("Unknown vote")
     value = Vote.UPVOTE if action == "up" else Vote.DOWNVOTE
-    Vote.objects.filter(post=post, user=request.user).delete()
-    Vote.objects.create(post=post, user=request.user, value=value)
+    try:
+        cast_vote(pk, request.user, value)
+    except AnalysisPost.DoesNotExist:
+        raise Http404("No such analysis")
     return redirect("catalog:analysis_detail", pk=pk)
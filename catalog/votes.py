@@ -0,0 +1,61 @@
+"""
+catalog/votes.py
+Vote recording with denormalised counters on AnalysisPost.
+
+Functions
+---------
+cast_vote(post_id: int, user, value: int) -> bool
+"""
+
+from __future__ import annotations
+
+from django.db import transaction
+
+from catalog.models import AnalysisPost, Vote
+from catalog.ranking import hot_score
+
+_COUNTER = {Vote.UPVOTE: "upvotes", Vote.DOWNVOTE: "downvotes"}
+
+
+def cast_vote(post_id: int, user, value: int) -> bool:
+    """
+    Record *user*'s vote on a post and keep ``upvotes``/``downvotes`` and
+    ``hot_score`` in step, in one transaction. Returns False if the vote
+    was already cast.
+
+    The post row is locked first: the counter UPDATE would take that lock
+    anyway, and holding it up front serialises concurrent votes from the
+    same user so the counters cannot drift.
+    """
+    with transaction.atomic():
+        ups, downs, created_at = (
+            AnalysisPost.objects.select_for_update()
+            .filter(pk=post_id)
+            .values_list("upvotes", "downvotes", "created_at")
+            .get()
+        )
+        previous = (
+            Vote.objects.filter(post_id=post_id, user=user)
+            .values_list("value", flat=True)
+            .first()
+        )
+        if previous == value:
+            return False
+
+        # INSERT … ON CONFLICT (user_id, post_id) DO UPDATE SET value = …
+        Vote.objects.bulk_create(
+            [Vote(post_id=post_id, user=user, value=value)],
+            update_conflicts=True,
+            unique_fields=["user", "post"],
+            update_fields=["value"],
+        )
+        # The row is locked, so absolute values are safe
+        tally = {"upvotes": ups, "downvotes": downs}
+        tally[_COUNTER[value]] += 1
+        if previous is not None:
+            tally[_COUNTER[previous]] -= 1
+        AnalysisPost.objects.filter(pk=post_id).update(
+            **tally,
+            hot_score=hot_score(tally["upvotes"], tally["downvotes"], created_at),
+        )
+    return True
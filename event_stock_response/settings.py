@@ -75,8 +75,91 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
         "HOST": os.getenv("POSTGRES_HOST", "localhost"),
         "PORT": os.getenv("POSTGRES_PORT", "5432"),
+        # Keep connections open between requests; ping them before reuse
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
+# Local runs and tests without Postgres: SQLITE_PATH=db.sqlite3. Search then
+# falls back to substring matching (see catalog/search.py).
+if os.getenv("SQLITE_PATH"):
+    DATABASES["default"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / os.getenv("SQLITE_PATH"),
+    }
+
+# Upstream HTTP clients (LLM and price data, see catalog/clients.py)
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "20"))
+UPSTREAM_MAX_KEEPALIVE = int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "10"))
+UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "30"))
+UPSTREAM_TIMEOUT = float(os.getenv("UPSTREAM_TIMEOUT", "30"))
+
+# Upstream scheduling (see catalog/scheduler.py): (requests/second, burst)
+# per upstream, retry policy, and the wall-time cap for one whole analysis
+UPSTREAM_RATE_LIMITS = {
+    "llm": (float(os.getenv("LLM_RATE_LIMIT", "5")), 10),
+    "prices": (float(os.getenv("PRICES_RATE_LIMIT", "2")), 5),
+}
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "4"))
+UPSTREAM_BACKOFF_BASE = 0.5
+UPSTREAM_BACKOFF_MAX = 20.0
+ANALYSIS_TIME_BUDGET = float(os.getenv("ANALYSIS_TIME_BUDGET", "180"))
+
+# Ask for dates, descriptions and tickers in one structured LLM call
+# (catalog.utils.generate_study); falls back to separate calls if invalid
+LLM_ONE_SHOT = os.getenv("LLM_ONE_SHOT", "0") == "1"
+
+# Speculative prefetch while the user confirms dates (see catalog/prefetch.py)
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "1") == "1"
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "2"))
+PREFETCH_MAX_PENDING = int(os.getenv("PREFETCH_MAX_PENDING", "8"))
+PREFETCH_BUDGET = float(os.getenv("PREFETCH_BUDGET", "60"))
+PREFETCH_TTL = int(os.getenv("PREFETCH_TTL", "900"))
+# Step 2 waits this long for suggestions still being speculated
+PREFETCH_WAIT = float(os.getenv("PREFETCH_WAIT", "15"))
+
+# Ticker universe (see catalog/tickers.py). In strict mode, LLM-suggested
+# symbols missing from the index are dropped instead of passed through.
+TICKER_INDEX_PATH = os.getenv("TICKER_INDEX_PATH") or None
+TICKER_INDEX_STRICT = os.getenv("TICKER_INDEX_STRICT", "0") == "1"
+
+# Cache (prices, metadata). Local memory by default; point CACHE_BACKEND and
+# CACHE_LOCATION at a shared backend (e.g. redis) for multi-process deploys.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "event-stock-response"),
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    }
+}
+PRICE_CACHE_TTL = int(os.getenv("PRICE_CACHE_TTL", str(7 * 24 * 60 * 60)))
+
+# Fetch prices from an HTTP price service instead of Yahoo (see
+# catalog/prices.py); used to run against the load-test stubs
+PRICE_SERVICE_URL = os.getenv("PRICE_SERVICE_URL") or None
+
+TOP_FEED_CACHE_SECONDS = int(os.getenv("TOP_FEED_CACHE_SECONDS", "60"))
+
+# Ceiling for the price block held while computing daily event returns
+# (see catalog/returns.py); larger studies are split into windows and chunks
+RETURNS_MEMORY_LIMIT_MB = int(os.getenv("RETURNS_MEMORY_LIMIT_MB", "256"))
+# "serial" or "process" (split tickers across RETURNS_WORKERS processes that
+# map each price block from shared memory; see catalog/compute.py)
+RETURNS_BACKEND = os.getenv("RETURNS_BACKEND", "serial")
+RETURNS_WORKERS = int(os.getenv("RETURNS_WORKERS", str(os.cpu_count() or 1)))
+
+# New topics whose prompt is at least this similar (cosine, 0–1) to an
+# earlier one reuse its event dates (see catalog/similarity.py); >1 disables
+TOPIC_REUSE_THRESHOLD = float(os.getenv("TOPIC_REUSE_THRESHOLD", "0.75"))
+
+# Intraday event studies (see catalog/intraday.py). Yahoo serves 1m bars
+# for the last 30 days and 5m bars for the last 60.
+INTRADAY_INTERVAL = os.getenv("INTRADAY_INTERVAL", "5m")
+INTRADAY_CACHE_DIR = os.getenv(
+    "INTRADAY_CACHE_DIR", str(BASE_DIR / ".cache" / "intraday")
+)
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [